@@ -2,16 +2,23 @@
 Singleton dependency for VoiceStudio instance.
 Same logic as app.py's get_studio() but for FastAPI.
 """
+import threading
 from pathlib import Path
 from src.orchestrator import VoiceStudio
 
 _studio: VoiceStudio | None = None
+_studio_lock = threading.Lock()
 BASE_PATH = Path(__file__).resolve().parent.parent
+# BASE_PATH / "output" is served at this URL prefix (see api/main.py)
+OUTPUT_URL_PREFIX = "/output/"
 
 
 def get_studio() -> VoiceStudio:
-    """Returns singleton VoiceStudio instance."""
+    """Returns singleton VoiceStudio instance (double-checked locking,
+    so concurrent first requests can't build two studios)."""
     global _studio
     if _studio is None:
-        _studio = VoiceStudio(str(BASE_PATH))
+        with _studio_lock:
+            if _studio is None:
+                _studio = VoiceStudio(str(BASE_PATH))
     return _studio
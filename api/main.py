@@ -1,20 +1,35 @@
 """
 FastAPI application entry point.
-CORS, routers, static file serving for /output.
+CORS, routers, static file serving for /output, VoiceStudio warm-up on startup.
 """
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from api.deps import get_studio
 from api.routers import emotions, tts, content, voices, production, system
 
 BASE_PATH = Path(__file__).resolve().parent.parent
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build VoiceStudio (torch/CUDA init, voice library scan) at startup
+    # instead of inside the first request that needs it
+    await asyncio.to_thread(get_studio)
+    yield
+
+
 app = FastAPI(
     title="SiriloQwenTTS PRO",
     description="Professional TTS API powered by Qwen3-TTS",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS — allow Vite dev server and any local origin
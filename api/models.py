@@ -1,7 +1,7 @@
 """
 Pydantic schemas for all API request/response models.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 from typing import Optional
 
 
@@ -124,6 +124,8 @@ class ProductionGenerateResponse(BaseModel):
 
 
 class ProgressEvent(BaseModel):
+    # Schema of the SSE progress payload. Not instantiated per tick: the
+    # stream sends JobManager snapshot dicts encoded with orjson.
     status: str
     progress: float
     message: str
@@ -3,26 +3,30 @@ Content format detection endpoint.
 Wraps src/format_detector.py. No GPU required.
 """
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from src.format_detector import detect_format, get_format_info, extract_speakers
 from api.models import ContentDetectRequest, ContentDetectResponse
 
 router = APIRouter(prefix="/api/content", tags=["content"])
 
+# Format info is static: resolve it once per format instead of per request
+_INFO_BY_FMT = {
+    fmt: get_format_info(fmt)
+    for fmt in ("plain_text", "podcast_script", "audiobook_json")
+}
+_NO_SPEAKERS: tuple = ()
 
-@router.post("/detect", response_model=ContentDetectResponse)
+
+@router.post("/detect", responses={200: {"model": ContentDetectResponse}})
 def detect_content_format(req: ContentDetectRequest):
     fmt = detect_format(req.content)
-    info = get_format_info(fmt)
-
-    speakers = []
-    if fmt == "podcast_script":
-        speakers = extract_speakers(req.content)
+    info = _INFO_BY_FMT[fmt]
 
-    return ContentDetectResponse(
-        format=fmt,
-        label=info["label"],
-        description=info["description"],
-        color=info["color"],
-        speakers=speakers,
-    )
+    return ORJSONResponse({
+        "format": fmt,
+        "label": info["label"],
+        "description": info["description"],
+        "color": info["color"],
+        "speakers": extract_speakers(req.content) if fmt == "podcast_script" else _NO_SPEAKERS,
+    })
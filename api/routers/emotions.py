@@ -2,10 +2,11 @@
 Endpoints for emotions, styles, modalities, text analysis, and instruct building.
 Read-only, no GPU required.
 """
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 
 from src.emotions import (
-    EMOTIONS, SPEAKING_STYLES, PACE, INTENSITY, PRESETS, MODALITIES,
+    EMOTIONS, SPEAKING_STYLES, PACE, INTENSITY, PRESETS,
     INTENSITY_LEVELS,
     build_instruct, analyze_text, list_modalities,
 )
@@ -17,22 +18,25 @@ from api.models import (
 router = APIRouter(prefix="/api/emotions", tags=["emotions"])
 
 
-@router.get("", response_model=EmotionsResponse)
-def get_emotions():
-    presets = [
+# Built entirely from module-level constants, so serialize once at import
+_EMOTIONS_PAYLOAD: bytes = orjson.dumps({
+    "emotions": list(EMOTIONS.keys()),
+    "emotion_details": EMOTIONS,
+    "styles": list(SPEAKING_STYLES.keys()),
+    "paces": list(PACE.keys()),
+    "intensities": list(INTENSITY.keys()),
+    "intensity_levels": INTENSITY_LEVELS,
+    "presets": [
         {"name": name, "description": data["description"], "instruct": data["instruct"]}
         for name, data in PRESETS.items()
-    ]
-    return EmotionsResponse(
-        emotions=list(EMOTIONS.keys()),
-        emotion_details=EMOTIONS,
-        styles=list(SPEAKING_STYLES.keys()),
-        paces=list(PACE.keys()),
-        intensities=list(INTENSITY.keys()),
-        intensity_levels=INTENSITY_LEVELS,
-        presets=presets,
-        modalities=list_modalities(),
-    )
+    ],
+    "modalities": list_modalities(),
+})
+
+
+@router.get("", responses={200: {"model": EmotionsResponse}})
+def get_emotions():
+    return Response(content=_EMOTIONS_PAYLOAD, media_type="application/json")
 
 
 @router.post("/build-instruct", response_model=BuildInstructResponse)
@@ -46,11 +50,11 @@ def build_instruct_endpoint(req: BuildInstructRequest):
         custom=req.custom,
         add_variation=req.add_variation,
     )
-    return BuildInstructResponse(instruct=instruct)
+    return BuildInstructResponse.model_construct(instruct=instruct)
 
 
 @router.post("/analyze", response_model=AnalyzeTextResponse)
 def analyze_text_endpoint(req: AnalyzeTextRequest):
     """Analyze text and return detected emotion with English prompt for Qwen3-TTS."""
     result = analyze_text(req.text, req.language)
-    return AnalyzeTextResponse(**result)
+    return AnalyzeTextResponse.model_construct(**result)
@@ -1,123 +1,131 @@
 """
 Unified production endpoint with background jobs and SSE progress.
-Dispatches to generate_tts / process_audiobook_json / process_podcast_script.
+Dispatches to generate_tts / process_audiobook_content / process_podcast_content.
 """
 import asyncio
-import json
-import time
+import orjson
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from fastapi import APIRouter, HTTPException
-from sse_starlette.sse import EventSourceResponse
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 
-from api.deps import get_studio, BASE_PATH
+from api.deps import get_studio, BASE_PATH, OUTPUT_URL_PREFIX
 from api.models import ProductionGenerateRequest, ProductionGenerateResponse
 from api.services.job_manager import job_manager
 
 router = APIRouter(prefix="/api/production", tags=["production"])
 
+# Generations share a single GPU: run them one at a time in a dedicated pool
+_JOB_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-gen")
+MAX_PENDING_JOBS = 8
+_pending_jobs = 0  # only touched from the event loop
+
+
+def _generate_plain(job_id: str, req: ProductionGenerateRequest, studio, output_dir: Path) -> str:
+    studio.tts.load_model(req.model_version)
+    job_manager.update_progress(job_id, 0.2, "Model loaded, generating audio...")
+
+    voice = studio.voice_library.get_voice(req.voice_name) if req.voice_name else None
+    ref_audio = voice["audio_path"] if voice else None
+    ref_text = voice["transcript"] if voice else None
+
+    job_manager.update_progress(job_id, 0.3, "Synthesizing speech...")
+
+    filename = f"tts_{uuid.uuid4().hex[:12]}.wav"
+    output_path = str(output_dir / filename)
+    audio, sr = studio.tts.generate(
+        text=req.content,
+        ref_audio_path=ref_audio,
+        ref_text=ref_text,
+        instruct=req.instruct,
+        language=req.language,
+        speaker=req.speaker,
+        output_path=output_path,
+    )
+    job_manager.update_progress(job_id, 0.95, "Saving audio...")
+    return OUTPUT_URL_PREFIX + filename
+
+
+def _generate_audiobook(job_id: str, req: ProductionGenerateRequest, studio, output_dir: Path) -> str:
+    def progress_cb(progress, message):
+        job_manager.update_progress(job_id, 0.1 + progress * 0.85, message)
+
+    result_path = studio.process_audiobook_content(
+        content=req.content,
+        title=f"audiobook_{uuid.uuid4().hex[:12]}",
+        model_version=req.model_version,
+        voice_name=req.voice_name,
+        speaker=req.speaker,
+        language=req.language,
+        progress_callback=progress_cb,
+    )
+    return OUTPUT_URL_PREFIX + Path(result_path).name
+
+
+def _generate_podcast(job_id: str, req: ProductionGenerateRequest, studio, output_dir: Path) -> str:
+    def progress_cb(progress, message):
+        job_manager.update_progress(job_id, 0.1 + progress * 0.85, message)
+
+    result_path = studio.process_podcast_content(
+        script_text=req.content,
+        name=uuid.uuid4().hex[:12],
+        speaker_voices=req.speaker_voices,
+        model_version=req.model_version,
+        language=req.language,
+        progress_callback=progress_cb,
+    )
+    return OUTPUT_URL_PREFIX + Path(result_path).name
+
+
+# format -> handler(job_id, req, studio, output_dir) returning the audio URL
+_HANDLERS = {
+    "plain_text": _generate_plain,
+    "audiobook_json": _generate_audiobook,
+    "podcast_script": _generate_podcast,
+}
+
 
 def _run_generation(job_id: str, req: ProductionGenerateRequest):
-    """Runs in a thread. Delegates to the appropriate studio method."""
+    """Runs in a thread. Delegates to the handler for req.format."""
     studio = get_studio()
     output_dir = BASE_PATH / "output"
     output_dir.mkdir(parents=True, exist_ok=True)
 
     try:
         job_manager.update_progress(job_id, 0.05, "Loading model...")
-
-        if req.format == "plain_text":
-            studio.tts.load_model(req.model_version)
-            job_manager.update_progress(job_id, 0.2, "Model loaded, generating audio...")
-
-            voice = studio.voice_library.get_voice(req.voice_name) if req.voice_name else None
-            ref_audio = voice["audio_path"] if voice else None
-            ref_text = voice["transcript"] if voice else None
-
-            job_manager.update_progress(job_id, 0.3, "Synthesizing speech...")
-
-            output_path = str(output_dir / f"tts_{int(time.time())}.wav")
-            audio, sr = studio.tts.generate(
-                text=req.content,
-                ref_audio_path=ref_audio,
-                ref_text=ref_text,
-                instruct=req.instruct,
-                language=req.language,
-                speaker=req.speaker,
-                output_path=output_path,
-            )
-            job_manager.update_progress(job_id, 0.95, "Saving audio...")
-            rel_path = Path(output_path).relative_to(BASE_PATH)
-            audio_url = f"/{rel_path.as_posix()}"
-
-        elif req.format == "audiobook_json":
-            def progress_cb(progress, message):
-                job_manager.update_progress(job_id, 0.1 + progress * 0.85, message)
-
-            # Write content to temp JSON file
-            tmp_json = output_dir / f"_audiobook_{int(time.time())}.json"
-            with open(tmp_json, "w", encoding="utf-8") as f:
-                f.write(req.content)
-
-            result_path = studio.process_audiobook_json(
-                json_path=str(tmp_json),
-                model_version=req.model_version,
-                voice_name=req.voice_name,
-                speaker=req.speaker,
-                language=req.language,
-                progress_callback=progress_cb,
-            )
-
-            # Clean up temp file
-            tmp_json.unlink(missing_ok=True)
-
-            rel_path = Path(result_path).relative_to(BASE_PATH)
-            audio_url = f"/{rel_path.as_posix()}"
-
-        elif req.format == "podcast_script":
-            if not req.speaker_voices:
-                raise ValueError("speaker_voices is required for podcast format")
-
-            def progress_cb(progress, message):
-                job_manager.update_progress(job_id, 0.1 + progress * 0.85, message)
-
-            # Write content to temp script file
-            tmp_script = output_dir / f"_podcast_{int(time.time())}.txt"
-            with open(tmp_script, "w", encoding="utf-8") as f:
-                f.write(req.content)
-
-            result_path = studio.process_podcast_script(
-                script_path=str(tmp_script),
-                speaker_voices=req.speaker_voices,
-                model_version=req.model_version,
-                language=req.language,
-                progress_callback=progress_cb,
-            )
-
-            # Clean up temp file
-            tmp_script.unlink(missing_ok=True)
-
-            rel_path = Path(result_path).relative_to(BASE_PATH)
-            audio_url = f"/{rel_path.as_posix()}"
-
-        else:
-            raise ValueError(f"Unknown format: {req.format}")
-
+        audio_url = _HANDLERS[req.format](job_id, req, studio, output_dir)
         job_manager.complete_job(job_id, audio_url)
 
     except Exception as e:
         job_manager.fail_job(job_id, str(e))
 
 
+def _on_job_done(_future):
+    global _pending_jobs
+    _pending_jobs -= 1
+
+
 @router.post("/generate", response_model=ProductionGenerateResponse)
 async def generate_production(req: ProductionGenerateRequest):
     """Start a background generation job. Returns job_id for SSE progress tracking."""
+    global _pending_jobs
+    if req.format not in _HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {req.format}")
+    if req.format == "podcast_script" and not req.speaker_voices:
+        raise HTTPException(status_code=400, detail="speaker_voices is required for podcast format")
+    if _pending_jobs >= MAX_PENDING_JOBS:
+        raise HTTPException(status_code=429, detail="Too many pending jobs, try again later")
+
     job = job_manager.create_job()
 
     # Run generation in background thread (don't await — it runs asynchronously)
-    loop = asyncio.get_event_loop()
-    loop.run_in_executor(None, _run_generation, job.id, req)
+    loop = asyncio.get_running_loop()
+    _pending_jobs += 1
+    future = loop.run_in_executor(_JOB_POOL, _run_generation, job.id, req)
+    future.add_done_callback(_on_job_done)
 
-    return ProductionGenerateResponse(job_id=job.id)
+    return ProductionGenerateResponse.model_construct(job_id=job.id)
 
 
 @router.get("/progress/{job_id}")
@@ -129,6 +137,12 @@ async def stream_progress(job_id: str):
 
     async def event_generator():
         async for data in job_manager.stream_progress(job_id):
-            yield {"event": "progress", "data": json.dumps(data)}
-
-    return EventSourceResponse(event_generator())
+            yield ServerSentEvent(data=orjson.dumps(data).decode(), event="progress")
+
+    # Keepalive pings stop proxies from dropping long audiobook streams;
+    # X-Accel-Buffering disables nginx response buffering for SSE.
+    return EventSourceResponse(
+        event_generator(),
+        ping=15,
+        headers={"X-Accel-Buffering": "no"},
+    )
@@ -9,16 +9,19 @@ from api.models import SystemStatusResponse, SystemUnloadResponse
 
 router = APIRouter(prefix="/api/system", tags=["system"])
 
+# CUDA availability can't change while the process runs
+_GPU_AVAILABLE = torch.cuda.is_available()
+
 
 @router.get("/status", response_model=SystemStatusResponse)
 def get_status():
     studio = get_studio()
-    gpu_available = torch.cuda.is_available()
+    gpu_available = _GPU_AVAILABLE
     model_loaded = studio.tts.model is not None
     current_model = studio.tts.current_model_name if model_loaded else None
     voice_count = len(studio.voice_library.list_voices())
 
-    return SystemStatusResponse(
+    return SystemStatusResponse.model_construct(
         gpu_available=gpu_available,
         model_loaded=model_loaded,
         current_model=current_model,
@@ -28,9 +31,5 @@ def get_status():
 
 @router.post("/unload", response_model=SystemUnloadResponse)
 def unload_models():
-    studio = get_studio()
-    studio.tts.unload_model()
-    if hasattr(studio, "asr") and studio.asr.model is not None:
-        studio.asr.unload_model()
-    torch.cuda.empty_cache()
-    return SystemUnloadResponse(message="Models unloaded, GPU memory freed")
+    get_studio().unload_models()
+    return SystemUnloadResponse.model_construct(message="Models unloaded, GPU memory freed")
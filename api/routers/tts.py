@@ -1,13 +1,12 @@
 """
 TTS model info and synchronous generation for short texts.
 """
-import time
-import soundfile as sf
-from pathlib import Path
-from fastapi import APIRouter, HTTPException
+import uuid
+import orjson
+from fastapi import APIRouter, HTTPException, Response
 
 from src.tts_engine import MODELS, MODEL_CAPABILITIES, SPEAKERS, ALL_SPEAKERS
-from api.deps import get_studio, BASE_PATH
+from api.deps import get_studio, BASE_PATH, OUTPUT_URL_PREFIX
 from api.models import (
     ModelsResponse, SpeakersResponse,
     TTSGenerateRequest, TTSGenerateResponse,
@@ -16,14 +15,18 @@ from api.models import (
 router = APIRouter(prefix="/api/tts", tags=["tts"])
 
 
-@router.get("/models", response_model=ModelsResponse)
+_MODELS_PAYLOAD: bytes = orjson.dumps({"models": MODELS, "capabilities": MODEL_CAPABILITIES})
+_SPEAKERS_PAYLOAD: bytes = orjson.dumps({"speakers": SPEAKERS, "all_speakers": ALL_SPEAKERS})
+
+
+@router.get("/models", responses={200: {"model": ModelsResponse}})
 def get_models():
-    return ModelsResponse(models=MODELS, capabilities=MODEL_CAPABILITIES)
+    return Response(content=_MODELS_PAYLOAD, media_type="application/json")
 
 
-@router.get("/speakers", response_model=SpeakersResponse)
+@router.get("/speakers", responses={200: {"model": SpeakersResponse}})
 def get_speakers():
-    return SpeakersResponse(speakers=SPEAKERS, all_speakers=ALL_SPEAKERS)
+    return Response(content=_SPEAKERS_PAYLOAD, media_type="application/json")
 
 
 @router.post("/generate", response_model=TTSGenerateResponse)
@@ -33,7 +36,8 @@ def generate_tts(req: TTSGenerateRequest):
 
     output_dir = BASE_PATH / "output"
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = str(output_dir / f"tts_{int(time.time())}.wav")
+    filename = f"tts_{uuid.uuid4().hex[:12]}.wav"
+    output_path = str(output_dir / filename)
 
     try:
         studio.tts.load_model(req.model_version)
@@ -53,9 +57,8 @@ def generate_tts(req: TTSGenerateRequest):
         )
 
         duration = len(audio) / sr
-        rel_path = Path(output_path).relative_to(BASE_PATH)
-        return TTSGenerateResponse(
-            audio_url=f"/{rel_path.as_posix()}",
+        return TTSGenerateResponse.model_construct(
+            audio_url=OUTPUT_URL_PREFIX + filename,
             duration_seconds=round(duration, 2),
         )
     except Exception as e:
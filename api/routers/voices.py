@@ -1,9 +1,10 @@
 """
 Voice CRUD endpoints. Upload audio for cloning, list, delete.
 """
+import asyncio
 import shutil
-from pathlib import Path
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse
 
 from src.tts_engine import ALL_SPEAKERS
 from api.deps import get_studio, BASE_PATH
@@ -12,21 +13,21 @@ from api.models import VoiceProfile, VoiceListResponse, VoiceCreateResponse
 router = APIRouter(prefix="/api/voices", tags=["voices"])
 
 
-@router.get("", response_model=VoiceListResponse)
+@router.get("", responses={200: {"model": VoiceListResponse}})
 def list_voices():
     studio = get_studio()
     cloned = []
     for name in studio.voice_library.list_voices():
         profile = studio.voice_library.get_voice(name)
         if profile:
-            cloned.append(VoiceProfile(
-                name=profile["name"],
-                audio_path=profile["audio_path"],
-                transcript=profile.get("transcript", ""),
-                language=profile.get("language", "Spanish"),
-                style_tags=profile.get("style_tags", []),
-            ))
-    return VoiceListResponse(qwen_speakers=ALL_SPEAKERS, cloned_voices=cloned)
+            cloned.append({
+                "name": profile["name"],
+                "audio_path": profile["audio_path"],
+                "transcript": profile.get("transcript", ""),
+                "language": profile.get("language", "Spanish"),
+                "style_tags": profile.get("style_tags", []),
+            })
+    return ORJSONResponse({"qwen_speakers": ALL_SPEAKERS, "cloned_voices": cloned})
 
 
 @router.post("", response_model=VoiceCreateResponse)
@@ -50,15 +51,20 @@ async def create_voice(
     upload_dir.mkdir(parents=True, exist_ok=True)
     temp_path = upload_dir / f"_upload_{name}.wav"
 
-    with open(temp_path, "wb") as f:
-        content = await audio.read()
-        f.write(content)
+    # Copy in chunks from the spooled upload, off the event loop
+    def _save_upload():
+        with open(temp_path, "wb") as f:
+            shutil.copyfileobj(audio.file, f, 1 << 20)
+
+    await asyncio.to_thread(_save_upload)
 
     try:
         tags = [t.strip() for t in style_tags.split(",") if t.strip()] if style_tags else []
 
+        # Cleaning, ASR and the library writes are blocking: keep them off the loop
         if auto_transcribe:
-            profile = studio.create_voice_profile(
+            profile = await asyncio.to_thread(
+                studio.create_voice_profile,
                 name=name,
                 audio_path=str(temp_path),
                 language=language,
@@ -66,7 +72,8 @@ async def create_voice(
                 style_tags=tags,
             )
         else:
-            profile = studio.voice_library.add_voice(
+            profile = await asyncio.to_thread(
+                studio.voice_library.add_voice,
                 name=name,
                 audio_path=str(temp_path),
                 transcript=transcript,
@@ -74,8 +81,8 @@ async def create_voice(
                 style_tags=tags,
             )
 
-        return VoiceCreateResponse(
-            profile=VoiceProfile(**profile),
+        return VoiceCreateResponse.model_construct(
+            profile=VoiceProfile.model_construct(**profile),
             message=f"Voice '{name}' created successfully",
         )
     except Exception as e:
@@ -19,16 +19,21 @@ class Job:
     audio_url: str | None = None
     error: str | None = None
     _lock: threading.Lock = field(default_factory=threading.Lock)
-    _updated: bool = False
+    _loop: asyncio.AbstractEventLoop | None = None
+    _listeners: set[asyncio.Event] = field(default_factory=set)
 
 
 class JobManager:
+    # Finished jobs stay queryable for this long, then are dropped from self.jobs
+    JOB_TTL_S = 300
+
     def __init__(self):
         self.jobs: dict[str, Job] = {}
 
     def create_job(self) -> Job:
-        job_id = str(uuid.uuid4())[:8]
-        job = Job(id=job_id)
+        """Must be called from the event loop that will stream the job's progress."""
+        job_id = uuid.uuid4().hex[:12]
+        job = Job(id=job_id, _loop=asyncio.get_running_loop())
         self.jobs[job_id] = job
         return job
 
@@ -43,7 +48,7 @@ class JobManager:
                 job.status = "running"
                 job.progress = progress
                 job.message = message
-                job._updated = True
+            self._notify(job)
 
     def complete_job(self, job_id: str, audio_url: str):
         """Thread-safe job completion."""
@@ -54,7 +59,8 @@ class JobManager:
                 job.progress = 1.0
                 job.message = "Completado"
                 job.audio_url = audio_url
-                job._updated = True
+            self._notify(job)
+            self._schedule_cleanup(job)
 
     def fail_job(self, job_id: str, error: str):
         """Thread-safe job failure."""
@@ -64,35 +70,61 @@ class JobManager:
                 job.status = "failed"
                 job.message = error
                 job.error = error
-                job._updated = True
+            self._notify(job)
+            self._schedule_cleanup(job)
+
+    def _notify(self, job: Job):
+        """Wakes every SSE stream of the job. Safe to call from worker threads."""
+        if job._loop is not None and not job._loop.is_closed():
+            job._loop.call_soon_threadsafe(self._wake_listeners, job)
+
+    def _schedule_cleanup(self, job: Job):
+        """Removes a finished job after JOB_TTL_S. Safe to call from worker threads."""
+        if job._loop is not None and not job._loop.is_closed():
+            job._loop.call_soon_threadsafe(
+                job._loop.call_later, self.JOB_TTL_S, self.jobs.pop, job.id, None
+            )
+
+    @staticmethod
+    def _wake_listeners(job: Job):
+        for event in job._listeners:
+            event.set()
 
     def _snapshot(self, job: Job) -> dict:
+        # Copy fields under the lock, build the dict after releasing it
         with job._lock:
-            job._updated = False
-            return {
-                "status": job.status,
-                "progress": job.progress,
-                "message": job.message,
-                "audio_url": job.audio_url,
-                "error": job.error,
-            }
+            status, progress, message = job.status, job.progress, job.message
+            audio_url, error = job.audio_url, job.error
+        # Like response_model_exclude_none: unset optional fields are omitted
+        snapshot = {"status": status, "progress": progress, "message": message}
+        if audio_url is not None:
+            snapshot["audio_url"] = audio_url
+        if error is not None:
+            snapshot["error"] = error
+        return snapshot
 
     async def stream_progress(self, job_id: str) -> AsyncGenerator[dict, None]:
         """Yields progress dicts until job is completed or failed.
-        Polls every 0.5s — simple, thread-safe, no asyncio.Event issues."""
+        Each stream owns an asyncio.Event that worker threads set through
+        call_soon_threadsafe, so updates are pushed as soon as they happen."""
         job = self.jobs.get(job_id)
         if not job:
             yield {"status": "failed", "progress": 0, "message": "Job not found",
-                   "error": "Job not found", "audio_url": None}
+                   "error": "Job not found"}
             return
 
-        # Send current state first
-        yield self._snapshot(job)
+        event = asyncio.Event()
+        job._listeners.add(event)
+        try:
+            # Send current state first
+            yield self._snapshot(job)
 
-        while job.status not in ("completed", "failed"):
-            await asyncio.sleep(0.5)
-            if job._updated or job.status in ("completed", "failed"):
+            while job.status not in ("completed", "failed"):
+                await event.wait()
+                event.clear()
                 yield self._snapshot(job)
+        finally:
+            job._listeners.discard(event)
 
 
 # Singleton
@@ -2,86 +2,224 @@
 SiriloQwenTTS Pro - UI
 Sistema de sintesis de voz con Qwen3-TTS
 """
+import hashlib
+import importlib
 import os
 import sys
-import json
-import tempfile
+import orjson
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from typing import Optional, Tuple, List, TYPE_CHECKING
 
 import gradio as gr
-import numpy as np
-import soundfile as sf
-import torch
 
 # Agregar src al path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.orchestrator import VoiceStudio
-from src.tts_engine import SPEAKERS, ALL_SPEAKERS
+from src.model_catalog import SPEAKERS, ALL_SPEAKERS, MODEL_CAPABILITIES
 from src.emotions import (
     EMOTION_CHOICES, STYLE_CHOICES, PACE_CHOICES, INTENSITY_CHOICES,
-    PRESET_CHOICES, PRESETS, build_instruct, get_preset_instruct
+    PRESET_CHOICES, PRESETS, PRESET_CONTROLS, DEFAULT_PRESET_CONTROLS,
+    build_instruct
 )
 from src.format_detector import detect_format, detect_from_file, get_format_info, extract_speakers
 
+if TYPE_CHECKING:
+    from src.orchestrator import VoiceStudio
+
 # Configuracion
 BASE_PATH = Path(__file__).parent
-STUDIO: Optional[VoiceStudio] = None
+LAST_GENERATION_PATH = str(BASE_PATH / "output" / "last_generation.wav")
+STUDIO: Optional["VoiceStudio"] = None
+_STUDIO_LOCK = threading.Lock()
+_STUDIO_READY = threading.Event()
+
+# Los eventos que usan la GPU comparten esta cola con concurrency_limit=1
+GPU_CONCURRENCY_ID = "gpu"
+
+# Director: segmentos con misma voz e instruccion por llamada a generate_batch
+DIRECTOR_BATCH_SIZE = 4
+DIRECTOR_BATCH_MAX_CHARS = 1500
+
+# Escrituras de WAV del Director fuera del hilo de generacion; un solo pool
+# por proceso en vez de crear hilos en cada clic
+_DIRECTOR_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="director-io")
+
+# El WAV de cada segmento tiene ruta fija por indice: el estado solo guarda
+# la marca "generated" de cada segmento, no las rutas
+DIRECTOR_SEGMENTS_DIR = BASE_PATH / "output" / "director_segments"
+
+# Pausa entre segmentos al unir el podcast del Director
+DIRECTOR_PAUSE_S = 0.3
 
 
-def get_studio() -> VoiceStudio:
-    """Singleton del VoiceStudio"""
+def get_studio() -> "VoiceStudio":
+    """Singleton del VoiceStudio (thread-safe: build_ui lo precalienta en segundo plano)"""
     global STUDIO
     if STUDIO is None:
-        STUDIO = VoiceStudio(str(BASE_PATH))
+        with _STUDIO_LOCK:
+            if STUDIO is None:
+                # Import diferido: orchestrator arrastra torch/librosa
+                from src.orchestrator import VoiceStudio
+                STUDIO = VoiceStudio(str(BASE_PATH))
+                _STUDIO_READY.set()
     return STUDIO
 
 
+def _prewarm():
+    """
+    Precalentamiento en segundo plano al arrancar
+
+    Construye el VoiceStudio y adelanta el import de qwen_tts (transformers y
+    sus kernels), que si no se paga en el primer clic de generacion. El modelo
+    no se carga aqui: ocuparia VRAM sin que el usuario lo pida.
+    """
+    get_studio()
+    try:
+        importlib.import_module("qwen_tts")
+    except Exception as e:
+        print(f"Precarga de qwen_tts omitida: {e}")
+
+
+def _get_studio_nowait() -> Optional["VoiceStudio"]:
+    """Retorna el VoiceStudio si ya esta listo, sin bloquear la construccion de la UI"""
+    return STUDIO if _STUDIO_READY.wait(timeout=0) else None
+
+
 def unload_models() -> str:
     """Libera todos los modelos de la memoria GPU"""
-    global STUDIO
+    import torch
+
     if STUDIO is not None:
-        STUDIO.tts.unload_model()
-        STUDIO.asr.unload_model()
-    torch.cuda.empty_cache()
+        STUDIO.unload_models()
+    if torch.cuda.is_available():
+        reserved_mb = torch.cuda.memory_reserved() / 2**20
+        return f"Modelos descargados de la GPU. VRAM reservada: {reserved_mb:.0f} MB"
     return "Modelos descargados de la GPU. Memoria liberada."
 
 
-def get_all_voices() -> List[str]:
-    """Retorna todas las voces disponibles (Qwen + Clonadas)"""
-    # Voces Qwen predefinidas
-    qwen_voices = [f"[Qwen] {s}" for s in ALL_SPEAKERS]
+# Etiquetas de voces Qwen precalculadas (constantes)
+_QWEN_ALL_LABELED = [f"[Qwen] {s}" for s in ALL_SPEAKERS]
+_QWEN_LABELED = {lang: [f"[Qwen] {s}" for s in speakers] for lang, speakers in SPEAKERS.items()}
+
+# Prefijo de etiqueta en los dropdowns -> tipo de voz
+_VOICE_TAGS = (("[Clonada] ", "clone"), ("[Qwen] ", "qwen"))
+
+
+def _parse_voice(label: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Separa una etiqueta de dropdown en (tipo, nombre)
+
+    tipo es "clone" | "qwen"; un nombre sin prefijo se trata como speaker Qwen.
+    (None, None) si no hay voz seleccionada.
+    """
+    if not label or label == "(sin voces)":
+        return None, None
+    for tag, kind in _VOICE_TAGS:
+        if label.startswith(tag):
+            return kind, label[len(tag):]
+    return "qwen", label
+
+
+def _resolve_voice(
+    studio: "VoiceStudio", voice_info: dict
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Voz del Director ({"type", "name"}) -> (ref_audio, ref_text, qwen_speaker)
+
+    Una voz clonada que ya no esta en la libreria queda como (None, None, None).
+    """
+    if voice_info["type"] == "clone":
+        voice_profile = studio.voice_library.get_voice(voice_info["name"])
+        if voice_profile:
+            return voice_profile["audio_path"], voice_profile["transcript"], None
+        return None, None, None
+    return None, None, voice_info["name"]
+
+
+def _ensure_model(studio: "VoiceStudio", model_version: str, clone_only: bool):
+    """
+    Carga el modelo elegido salvo que el cargado ya sirva para la peticion
+
+    Con voces clonadas el motor cambia solo a 1.7B-Base; volver a cargar el
+    modelo del selector en cada clic forzaria dos cargas completas por
+    generacion (selector -> Base).
+    """
+    if clone_only and "voice_clone" in MODEL_CAPABILITIES.get(studio.tts.current_model_name, []):
+        return
+    studio.tts.load_model(model_version)
+
+
+def _director_segment_path(index: int) -> str:
+    """Ruta del WAV de un segmento del Director"""
+    return str(DIRECTOR_SEGMENTS_DIR / f"segment_{index:03d}.wav")
+
+
+def _segment_sig(text: str, voice_info: dict, instruct: str, language: str, model_version: str) -> str:
+    """Firma de los parametros de generacion de un segmento del Director"""
+    key = f"{text}|{voice_info['type']}:{voice_info['name']}|{instruct}|{language}|{model_version}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=4)
+def _director_pause(sample_rate: int):
+    """Silencio PCM16 entre segmentos, uno por tasa de muestreo (compartido: solo lectura)"""
+    import numpy as np
+    pause = np.zeros(int(sample_rate * DIRECTOR_PAUSE_S), dtype=np.int16)
+    pause.flags.writeable = False
+    return pause
+
+
+# Se incrementa cada vez que cambia la libreria de voces; invalida _voice_choices
+_VOICES_VERSION = 0
 
+
+@lru_cache(maxsize=32)
+def _voice_choices(language: Optional[str], version: int) -> List[str]:
+    """
+    Voces clonadas + Qwen (language=None: todas). Cacheado por version de la libreria.
+    La lista retornada es compartida: no modificarla.
+    """
+    studio = get_studio()
+    if language is None:
+        cloned = [f"[Clonada] {name}" for name in studio.voice_library.list_voices()]
+        return cloned + _QWEN_ALL_LABELED
+
+    cloned = [
+        f"[Clonada] {name}"
+        for name, profile in studio.voice_library.voices.items()
+        if profile.get("language", "") == language
+    ]
+    return cloned + _QWEN_LABELED.get(language, _QWEN_ALL_LABELED)
+
+
+def get_all_voices(wait: bool = True) -> List[str]:
+    """Retorna todas las voces disponibles (Qwen + Clonadas)
+
+    Con wait=False no espera al VoiceStudio (omite las clonadas si aun no esta listo).
+    """
     # Voces clonadas (solo si studio ya existe)
-    cloned_voices = []
     try:
-        studio = get_studio()
-        cloned_voices = [f"[Clonada] {name}" for name in studio.voice_library.list_voices()]
+        studio = get_studio() if wait else _get_studio_nowait()
+        if studio is not None:
+            return _voice_choices(None, _VOICES_VERSION)
     except Exception:
         pass
 
-    return cloned_voices + qwen_voices
+    return _QWEN_ALL_LABELED
 
 
 def get_voices_for_language(language: str, return_list: bool = False):
     """Retorna speakers predefinidos + voces clonadas para un idioma"""
-    # Speakers predefinidos para el idioma
-    predefined = SPEAKERS.get(language, ALL_SPEAKERS)
-    predefined_labeled = [f"[Qwen] {s}" for s in predefined]
-
-    # Voces clonadas del usuario (filtrar por idioma)
-    cloned = []
+    # Primero clonadas (filtradas por idioma), luego predefinidas
     try:
-        studio = get_studio()
-        for name, profile in studio.voice_library.voices.items():
-            if profile.get("language", "") == language:
-                cloned.append(f"[Clonada] {name}")
+        all_voices = _voice_choices(language, _VOICES_VERSION)
     except Exception:
-        pass
-
-    # Combinar: primero clonadas, luego predefinidas
-    all_voices = cloned + predefined_labeled
+        all_voices = _QWEN_LABELED.get(language, _QWEN_ALL_LABELED)
 
     if not all_voices:
         all_voices = ["(sin voces)"]
@@ -93,21 +231,14 @@ def get_voices_for_language(language: str, return_list: bool = False):
 
 
 def get_initial_voices():
-    """Obtiene voces iniciales incluyendo clonadas"""
-    # Voces Qwen para Spanish
-    qwen = [f"[Qwen] {s}" for s in SPEAKERS.get("Spanish", ALL_SPEAKERS)]
-
-    # Intentar cargar voces clonadas
-    cloned = []
+    """Obtiene voces iniciales incluyendo clonadas (sin bloquear; app.load refresca la lista)"""
     try:
-        studio = get_studio()
-        for name, profile in studio.voice_library.voices.items():
-            if profile.get("language", "") == "Spanish":
-                cloned.append(f"[Clonada] {name}")
+        if _get_studio_nowait() is not None:
+            return _voice_choices("Spanish", _VOICES_VERSION)
     except Exception:
         pass
 
-    return cloned + qwen
+    return _QWEN_LABELED["Spanish"]
 
 
 def create_voice_profile(
@@ -119,6 +250,8 @@ def create_voice_profile(
     style_tags: str
 ):
     """Crea un nuevo perfil de voz"""
+    global _VOICES_VERSION
+
     if not name or not audio_file:
         return "Error: Nombre y audio son requeridos", None
 
@@ -131,18 +264,16 @@ def create_voice_profile(
             name=name,
             audio_path=audio_file,
             language=language,
-            auto_transcribe=auto_transcribe and not manual_transcript,
-            style_tags=tags
+            auto_transcribe=auto_transcribe,
+            style_tags=tags,
+            # Con transcripcion manual no se corre el ASR y el perfil se escribe una sola vez
+            transcript=manual_transcript or ""
         )
 
-        # Si hay transcripcion manual, actualizar
-        if manual_transcript:
-            profile["transcript"] = manual_transcript
-            json_path = studio.voice_library.library_path / f"{name}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(profile, f, ensure_ascii=False, indent=2)
+        # Invalidar listas de voces cacheadas
+        _VOICES_VERSION += 1
 
-        return f"Voz '{name}' creada exitosamente", json.dumps(profile, indent=2, ensure_ascii=False)
+        return f"Voz '{name}' creada exitosamente", orjson.dumps(profile, option=orjson.OPT_INDENT_2).decode()
 
     except Exception as e:
         return f"Error: {str(e)}", None
@@ -156,6 +287,8 @@ def generate_tts(
     language: str
 ):
     """Genera audio desde texto"""
+    from src.tts_engine import AudioProcessor
+
     # Validacion de entradas
     if not text or not text.strip():
         return None, "Error: El texto no puede estar vacio"
@@ -171,16 +304,11 @@ def generate_tts(
         cloned_voice = None
         speaker = None
 
-        if voice_name and voice_name != "(sin voces)":
-            if voice_name.startswith("[Clonada] "):
-                cloned_voice = voice_name.replace("[Clonada] ", "")
-            elif voice_name.startswith("[Qwen] "):
-                speaker = voice_name.replace("[Qwen] ", "")
-            else:
-                speaker = voice_name
-
-        # Cargar modelo
-        studio.tts.load_model(model_version)
+        kind, name = _parse_voice(voice_name)
+        if kind == "clone":
+            cloned_voice = name
+        elif kind == "qwen":
+            speaker = name
 
         # Obtener datos de voz clonada si aplica
         ref_audio = None
@@ -193,6 +321,9 @@ def generate_tts(
             else:
                 return None, f"Error: Voz clonada '{cloned_voice}' no encontrada en la libreria"
 
+        # Cargar modelo
+        _ensure_model(studio, model_version, clone_only=bool(ref_audio and ref_text))
+
         # Generar audio
         audio, sr = studio.tts.generate(
             text=text,
@@ -203,12 +334,10 @@ def generate_tts(
             language=language
         )
 
-        # Guardar temporalmente para reproducir
-        (BASE_PATH / "output").mkdir(parents=True, exist_ok=True)
-        output_path = str(BASE_PATH / "output" / "last_generation.wav")
-        sf.write(output_path, audio, sr, format='WAV', subtype='PCM_16')
+        # Guardar temporalmente para reproducir (output/ ya lo crea VoiceStudio)
+        AudioProcessor.write_wav_pcm16(LAST_GENERATION_PATH, audio, sr)
 
-        return output_path, f"Generado: {len(audio)/sr:.1f}s de audio"
+        return LAST_GENERATION_PATH, f"Generado: {len(audio)/sr:.1f}s de audio"
 
     except FileNotFoundError as e:
         return None, f"Error: Archivo no encontrado - {str(e)}"
@@ -220,10 +349,11 @@ def generate_tts(
         return None, f"Error inesperado: {str(e)}"
 
 
-def process_audiobook(json_file, model_version: str, voice_name: str, language: str, progress=gr.Progress()):
-    """Procesa un audiolibro desde JSON"""
-    if not json_file:
-        return None, "Error: Archivo JSON requerido"
+def process_audiobook(content: str, title: str, model_version: str, voice_name: str, language: str,
+                      batch_size: int = 4, progress=gr.Progress()):
+    """Procesa un audiolibro desde el contenido JSON (sin archivo temporal)"""
+    if not content:
+        return None, "Error: JSON de audiolibro requerido"
 
     studio = get_studio()
 
@@ -235,21 +365,21 @@ def process_audiobook(json_file, model_version: str, voice_name: str, language:
         cloned_voice = None
         speaker = None
 
-        if voice_name and voice_name != "(sin voces)":
-            if voice_name.startswith("[Clonada] "):
-                cloned_voice = voice_name.replace("[Clonada] ", "")
-            elif voice_name.startswith("[Qwen] "):
-                speaker = voice_name.replace("[Qwen] ", "")
-            else:
-                speaker = voice_name
+        kind, name = _parse_voice(voice_name)
+        if kind == "clone":
+            cloned_voice = name
+        elif kind == "qwen":
+            speaker = name
 
-        output_path = studio.process_audiobook_json(
-            json_file,
+        output_path = studio.process_audiobook_content(
+            content,
+            title,
             model_version=model_version,
             voice_name=cloned_voice,
             speaker=speaker,
             language=language,
-            progress_callback=update_progress
+            progress_callback=update_progress,
+            batch_size=batch_size
         )
 
         return output_path, f"Audiolibro generado: {output_path}"
@@ -258,10 +388,19 @@ def process_audiobook(json_file, model_version: str, voice_name: str, language:
         return None, f"Error: {str(e)}"
 
 
+def apply_preset(preset):
+    """Valores de los controles de estilo para un preset"""
+    return PRESET_CONTROLS.get(preset, DEFAULT_PRESET_CONTROLS)
+
+
 # === Funciones del Editor Universal (Proyecto) ===
 
-def on_content_change(text_content):
+def on_content_change(text_content, file_obj=None):
     """Detecta formato cuando el usuario escribe texto"""
+    if file_obj:
+        # Con archivo cargado manda el formato detectado en on_file_upload
+        return gr.update(), gr.update(), gr.update(), gr.update(), gr.update()
+
     if not text_content or not text_content.strip():
         info = get_format_info("plain_text")
         return (
@@ -270,6 +409,7 @@ def on_content_change(text_content):
             gr.update(visible=True),
             gr.update(visible=False),
             "",  # podcast info
+            "plain_text",
         )
 
     fmt = detect_format(text_content)
@@ -289,6 +429,7 @@ def on_content_change(text_content):
         gr.update(visible=is_plain_or_audiobook),
         gr.update(visible=is_podcast),
         podcast_info_text,
+        fmt,
     )
 
 
@@ -302,6 +443,7 @@ def on_file_upload(file_obj):
             gr.update(visible=True),
             gr.update(visible=False),
             "",
+            "plain_text",
         )
 
     try:
@@ -320,12 +462,12 @@ def on_file_upload(file_obj):
         display_content = content
         if fmt == "audiobook_json":
             try:
-                data = json.loads(content)
+                data = orjson.loads(content)
                 preview_text = data.get("tts_version", data.get("reading_version", ""))
                 if len(preview_text) > 500:
                     preview_text = preview_text[:500] + "..."
                 display_content = f"[Audiolibro JSON cargado]\n\n{preview_text}"
-            except (json.JSONDecodeError, ValueError):
+            except ValueError:
                 pass
 
         return (
@@ -334,6 +476,7 @@ def on_file_upload(file_obj):
             gr.update(visible=is_plain_or_audiobook),
             gr.update(visible=is_podcast),
             podcast_info_text,
+            fmt,
         )
 
     except Exception as e:
@@ -343,15 +486,26 @@ def on_file_upload(file_obj):
             gr.update(visible=True),
             gr.update(visible=False),
             "",
+            "plain_text",
         )
 
 
-def update_podcast_speaker_dropdowns(text_content):
-    """Actualiza dropdowns de speakers para podcast"""
-    if not text_content:
-        return [gr.update(visible=False)] * 6
+def update_podcast_speaker_dropdowns(text_content, last_sig=None):
+    """
+    Actualiza dropdowns de speakers para podcast
+
+    last_sig es la firma (speakers, version de la libreria) de la ultima
+    actualizacion de la sesion: si no cambio, no se reenvian los 6 dropdowns
+    (y no se pisan las voces ya elegidas).
+    """
+    speakers = extract_speakers(text_content) if text_content else []
+    sig = (tuple(speakers), _VOICES_VERSION)
+    if sig == last_sig:
+        return [gr.update()] * 6 + [last_sig]
+
+    if not speakers:
+        return [gr.update(visible=False)] * 6 + [sig]
 
-    speakers = extract_speakers(text_content)
     all_voices = get_all_voices()
 
     updates = []
@@ -366,18 +520,29 @@ def update_podcast_speaker_dropdowns(text_content):
         else:
             updates.append(gr.update(visible=False))
 
-    return updates
+    return updates + [sig]
+
+
+def _output_stem(source_file, prefix: str) -> str:
+    """Nombre base de salida: el del archivo subido o uno unico si vino de texto"""
+    if source_file:
+        return Path(source_file).stem
+    return f"{prefix}_{uuid.uuid4().hex[:12]}"
 
 
 def process_universal(
     text_content, file_obj, voice_name, model_version, language,
     preset, emotion, style, pace, intensity, custom_instruct,
     pv1, pv2, pv3, pv4, pv5, pv6,
+    precomputed_fmt=None,
     progress=gr.Progress()
 ):
     """
     Funcion unificada que despacha al procesador correcto segun formato.
     Reemplaza generate_tts, process_audiobook, y process_podcast_final.
+
+    precomputed_fmt es el formato ya detectado por on_content_change /
+    on_file_upload; solo se vuelve a detectar si no viene.
     """
     # Determinar contenido y formato
     content = ""
@@ -385,11 +550,16 @@ def process_universal(
     source_file = None
 
     if file_obj:
-        fmt, content = detect_from_file(file_obj)
+        if precomputed_fmt:
+            with open(file_obj, "r", encoding="utf-8") as f:
+                content = f.read()
+            fmt = precomputed_fmt
+        else:
+            fmt, content = detect_from_file(file_obj)
         source_file = file_obj
     elif text_content and text_content.strip():
         content = text_content.strip()
-        fmt = detect_format(content)
+        fmt = precomputed_fmt or detect_format(content)
     else:
         return None, "Error: Escribe texto o sube un archivo"
 
@@ -402,7 +572,7 @@ def process_universal(
             style or "conversacional",
             pace or "normal",
             intensity or "normal",
-            custom_instruct or ""
+            custom=custom_instruct or ""
         )
 
     studio = get_studio()
@@ -420,47 +590,26 @@ def process_universal(
             return None, result_status
 
         elif fmt == "audiobook_json":
-            # Guardar contenido JSON a archivo temporal si vino de texto
-            if not source_file:
-                tmp = tempfile.NamedTemporaryFile(
-                    mode='w', suffix='.json', delete=False, encoding='utf-8'
-                )
-                tmp.write(content)
-                tmp.close()
-                source_file = tmp.name
-
             progress(0.1, "Procesando audiolibro JSON...")
             result_audio, result_status = process_audiobook(
-                source_file, model_version, voice_name, language, progress
+                content, _output_stem(source_file, "audiobook"),
+                model_version, voice_name, language, progress=progress
             )
             if result_audio:
                 return result_audio, f"[{info['label']}] {result_status}"
             return None, result_status
 
         elif fmt == "podcast_script":
-            # Guardar script a archivo temporal si vino de texto
-            if not source_file:
-                tmp = tempfile.NamedTemporaryFile(
-                    mode='w', suffix='.txt', delete=False, encoding='utf-8'
-                )
-                tmp.write(content)
-                tmp.close()
-                source_file = tmp.name
-
             # Obtener speakers y crear voice_map
             speakers = extract_speakers(content)
             voice_selections = [pv1, pv2, pv3, pv4, pv5, pv6]
 
             voice_map = {}
             for i, speaker in enumerate(speakers):
-                if i < len(voice_selections) and voice_selections[i]:
-                    voice = voice_selections[i]
-                    if voice.startswith("[Clonada] "):
-                        voice_map[speaker] = voice.replace("[Clonada] ", "")
-                    elif voice.startswith("[Qwen] "):
-                        voice_map[speaker] = voice.replace("[Qwen] ", "")
-                    else:
-                        voice_map[speaker] = voice
+                if i < len(voice_selections):
+                    name = _parse_voice(voice_selections[i])[1]
+                    if name:
+                        voice_map[speaker] = name
 
             missing = [s for s in speakers if s not in voice_map]
             if missing:
@@ -471,8 +620,9 @@ def process_universal(
             def update_progress(value, message):
                 progress(value, desc=message)
 
-            output_path = studio.process_podcast_script(
-                source_file,
+            output_path = studio.process_podcast_content(
+                content,
+                _output_stem(source_file, "script"),
                 voice_map,
                 model_version,
                 language,
@@ -542,6 +692,9 @@ CUSTOM_CSS = """
 def build_ui():
     """Construye la interfaz de Gradio"""
 
+    # Construir el VoiceStudio en segundo plano mientras se arma la UI
+    threading.Thread(target=_prewarm, daemon=True).start()
+
     with gr.Blocks(title="SiriloQwenTTS Pro") as app:
 
         gr.Markdown(
@@ -560,6 +713,7 @@ def build_ui():
 
                 # Estado interno
                 proj_detected_format = gr.State("plain_text")
+                proj_speakers_sig = gr.State(None)
 
                 # --- PASO 1: Contenido ---
                 gr.Markdown("#### PASO 1: Contenido", elem_classes="step-header")
@@ -619,7 +773,7 @@ def build_ui():
                             lines=1
                         )
                         gr.Markdown("**Asignar voz a cada speaker:**")
-                        all_voice_choices = get_all_voices()
+                        all_voice_choices = get_all_voices(wait=False)
                         proj_spk1 = gr.Dropdown(choices=all_voice_choices, label="Speaker 1", visible=False)
                         proj_spk2 = gr.Dropdown(choices=all_voice_choices, label="Speaker 2", visible=False)
                         proj_spk3 = gr.Dropdown(choices=all_voice_choices, label="Speaker 3", visible=False)
@@ -668,22 +822,28 @@ def build_ui():
                 # === Conectar eventos del Proyecto ===
 
                 # Deteccion de formato al escribir texto
+                # (always_last: las pulsaciones durante un evento pendiente se agrupan en una)
                 proj_text.change(
                     on_content_change,
-                    inputs=[proj_text],
+                    inputs=[proj_text, proj_file],
                     outputs=[
                         proj_format_display,
                         proj_voice_single_panel,
                         proj_podcast_panel,
                         proj_podcast_info,
-                    ]
+                        proj_detected_format,
+                    ],
+                    trigger_mode="always_last",
+                    queue=False
                 )
 
                 # Actualizar speaker dropdowns cuando cambia el texto (para podcast)
                 proj_text.change(
                     update_podcast_speaker_dropdowns,
-                    inputs=[proj_text],
-                    outputs=proj_speaker_dropdowns
+                    inputs=[proj_text, proj_speakers_sig],
+                    outputs=proj_speaker_dropdowns + [proj_speakers_sig],
+                    trigger_mode="always_last",
+                    queue=False
                 )
 
                 # Deteccion de formato al subir archivo
@@ -696,58 +856,44 @@ def build_ui():
                         proj_voice_single_panel,
                         proj_podcast_panel,
                         proj_podcast_info,
-                    ]
+                        proj_detected_format,
+                    ],
+                    queue=False
                 )
 
                 # Actualizar voces cuando cambia idioma
                 proj_language.change(
                     get_voices_for_language,
                     inputs=[proj_language],
-                    outputs=[proj_voice]
+                    outputs=[proj_voice],
+                    queue=False
                 )
 
                 # Preview de instruccion
                 def proj_update_instruct(preset, emotion, style_val, pace, intensity, custom):
                     if preset != "(personalizado)" and preset in PRESETS:
                         return PRESETS[preset]["instruct"]
-                    return build_instruct(emotion, style_val, pace, intensity, custom)
-
-                for ctrl in [proj_preset, proj_emotion, proj_style, proj_pace, proj_intensity, proj_custom_instruct]:
-                    ctrl.change(
-                        proj_update_instruct,
-                        inputs=[proj_preset, proj_emotion, proj_style, proj_pace, proj_intensity, proj_custom_instruct],
-                        outputs=[proj_instruct_preview]
-                    )
+                    return build_instruct(emotion, style_val, pace, intensity, custom=custom)
+
+                # Un solo listener multi-evento (build_instruct esta memoizado,
+                # asi que seguir cada tecla del texto libre es barato)
+                gr.on(
+                    triggers=[
+                        proj_preset.change, proj_emotion.change, proj_style.change,
+                        proj_pace.change, proj_intensity.change, proj_custom_instruct.change,
+                    ],
+                    fn=proj_update_instruct,
+                    inputs=[proj_preset, proj_emotion, proj_style, proj_pace, proj_intensity, proj_custom_instruct],
+                    outputs=[proj_instruct_preview],
+                    queue=False
+                )
 
                 # Aplicar preset
-                def proj_apply_preset(preset):
-                    if preset == "(personalizado)":
-                        return "neutral", "conversacional", "normal", "normal", ""
-                    preset_configs = {
-                        "dialogo_casual": ("neutral", "conversacional", "normal", "normal", ""),
-                        "entrevista": ("serio", "profesional", "normal", "normal", ""),
-                        "historia_emocionante": ("emocionado", "narracion", "normal", "normal", ""),
-                        "explicacion_clara": ("neutral", "explicativo", "pausado", "normal", ""),
-                        "debate_apasionado": ("enojado", "autoritario", "rapido", "fuerte", ""),
-                        "comedia": ("alegre", "conversacional", "normal", "normal", "con timing comico"),
-                        "drama": ("dramatico", "narracion", "pausado", "fuerte", ""),
-                        "misterio": ("misterioso", "susurro", "lento", "suave", ""),
-                        "motivacional": ("emocionado", "autoritario", "normal", "proyectado", ""),
-                        "meditacion": ("neutral", "intimo", "lento", "suave", ""),
-                        "noticia_urgente": ("serio", "noticia", "rapido", "proyectado", ""),
-                        "cuento_infantil": ("alegre", "infantil", "normal", "normal", ""),
-                        "confesion": ("triste", "intimo", "lento", "susurrado", ""),
-                        "celebracion": ("emocionado", "conversacional", "rapido", "fuerte", ""),
-                        "despedida": ("triste", "intimo", "pausado", "suave", ""),
-                    }
-                    if preset in preset_configs:
-                        return preset_configs[preset]
-                    return "neutral", "conversacional", "normal", "normal", ""
-
                 proj_preset.change(
-                    proj_apply_preset,
+                    apply_preset,
                     inputs=[proj_preset],
-                    outputs=[proj_emotion, proj_style, proj_pace, proj_intensity, proj_custom_instruct]
+                    outputs=[proj_emotion, proj_style, proj_pace, proj_intensity, proj_custom_instruct],
+                    queue=False
                 )
 
                 # Boton principal: Generar
@@ -758,8 +904,11 @@ def build_ui():
                         proj_preset, proj_emotion, proj_style, proj_pace, proj_intensity,
                         proj_custom_instruct,
                         proj_spk1, proj_spk2, proj_spk3, proj_spk4, proj_spk5, proj_spk6,
+                        proj_detected_format,
                     ],
-                    outputs=[proj_audio, proj_status]
+                    outputs=[proj_audio, proj_status],
+                    concurrency_limit=1,
+                    concurrency_id=GPU_CONCURRENCY_ID
                 )
 
             # === TAB 2: Crear Voz ===
@@ -807,7 +956,9 @@ def build_ui():
                 create_btn.click(
                     create_voice_profile,
                     inputs=[voice_name, voice_audio, voice_language, auto_transcribe, manual_transcript, style_tags],
-                    outputs=[create_status, create_result]
+                    outputs=[create_status, create_result],
+                    concurrency_limit=1,
+                    concurrency_id=GPU_CONCURRENCY_ID
                 )
 
             # === TAB 3: Director Studio ===
@@ -830,7 +981,8 @@ def build_ui():
                 # Estado global para Director
                 director_segments = gr.State([])
                 director_voice_map = gr.State({})
-                director_generated_audios = gr.State({})
+                # Filas de la tabla ya construidas: generar solo reescribe las que cambian
+                director_table_state = gr.State([])
 
                 with gr.Row():
                     # Columna izquierda: configuracion
@@ -856,10 +1008,10 @@ def build_ui():
 
                         # Voces por speaker
                         gr.Markdown("**2. Asignar voces:**")
-                        dir_speaker1 = gr.Dropdown(choices=get_all_voices(), label="Speaker 1", visible=False)
-                        dir_speaker2 = gr.Dropdown(choices=get_all_voices(), label="Speaker 2", visible=False)
-                        dir_speaker3 = gr.Dropdown(choices=get_all_voices(), label="Speaker 3", visible=False)
-                        dir_speaker4 = gr.Dropdown(choices=get_all_voices(), label="Speaker 4", visible=False)
+                        dir_speaker1 = gr.Dropdown(choices=all_voice_choices, label="Speaker 1", visible=False)
+                        dir_speaker2 = gr.Dropdown(choices=all_voice_choices, label="Speaker 2", visible=False)
+                        dir_speaker3 = gr.Dropdown(choices=all_voice_choices, label="Speaker 3", visible=False)
+                        dir_speaker4 = gr.Dropdown(choices=all_voice_choices, label="Speaker 4", visible=False)
                         dir_voice_dropdowns = [dir_speaker1, dir_speaker2, dir_speaker3, dir_speaker4]
 
                         director_save_voices_btn = gr.Button("Guardar asignacion de voces", variant="secondary")
@@ -949,8 +1101,13 @@ def build_ui():
 
                 # === Funciones del Director ===
 
-                def analyze_director_script(script_file):
-                    """Analiza script y prepara segmentos"""
+                def analyze_director_script(script_file, progress=gr.Progress()):
+                    """
+                    Analiza script y prepara segmentos
+
+                    Handler sincrono: Gradio ya lo ejecuta en su pool de hilos, fuera del
+                    event loop; la barra de progreso muestra la etapa en scripts grandes.
+                    """
                     if not script_file:
                         return (
                             "Sube un script primero",
@@ -958,33 +1115,43 @@ def build_ui():
                             gr.update(visible=False), gr.update(visible=False),
                             gr.update(visible=False), gr.update(visible=False),
                             gr.update(maximum=0, value=0), "0",
-                            [], "", ""
+                            [], [], "", ""
                         )
 
                     studio = get_studio()
 
+                    progress(0.1, "Leyendo script...")
                     with open(script_file, 'r', encoding='utf-8') as f:
                         content = f.read()
 
+                    progress(0.4, "Parseando...")
                     parsed = studio.podcast.parse_script(content)
-                    speakers = sorted(set(seg.speaker for seg in parsed))
 
-                    # Convertir a lista serializable
-                    segments_data = [
-                        {
-                            "index": i,
+                    progress(0.8, "Preparando segmentos...")
+
+                    # Una sola pasada: segmentos (solo los campos que usan los handlers), tabla y speakers
+                    segments_data = []
+                    table_data = []
+                    speaker_set = set()
+                    for i, seg in enumerate(parsed):
+                        # Texto corto de la tabla, calculado una sola vez por segmento
+                        preview = seg.text[:40] + "..." if len(seg.text) > 40 else seg.text
+                        segments_data.append({
                             "speaker": seg.speaker,
                             "text": seg.text,
-                            "timestamp": seg.timestamp,
+                            "preview": preview,
                             "emotion": "neutral",
                             "style": "conversacional",
                             "pace": "normal",
                             "intensity": "normal",
                             "custom": "",
                             "generated": False
-                        }
-                        for i, seg in enumerate(parsed)
-                    ]
+                        })
+                        table_data.append([i, seg.speaker, preview, "Pendiente", "neutral"])
+                        speaker_set.add(seg.speaker)
+
+                    # Orden alfabetico: save_voice_assignment mapea los dropdowns en este mismo orden
+                    speakers = sorted(speaker_set)
 
                     info = f"Detectados {len(segments_data)} segmentos, {len(speakers)} speakers: {', '.join(speakers)}"
 
@@ -1002,12 +1169,8 @@ def build_ui():
                         else:
                             voice_updates.append(gr.update(visible=False))
 
-                    # Slider y tabla
+                    # Slider
                     max_seg = max(0, len(segments_data) - 1)
-                    table_data = [
-                        [s["index"], s["speaker"], s["text"][:40] + "...", "Pendiente", s["emotion"]]
-                        for s in segments_data
-                    ]
 
                     # Info del primer segmento
                     first_speaker = segments_data[0]["speaker"] if segments_data else ""
@@ -1021,6 +1184,7 @@ def build_ui():
                         gr.update(maximum=max_seg, value=0),
                         str(len(segments_data)),
                         table_data,
+                        table_data,
                         first_speaker,
                         first_text
                     )
@@ -1035,14 +1199,10 @@ def build_ui():
 
                     voice_map = {}
                     for i, speaker in enumerate(speakers):
-                        if i < len(voices) and voices[i]:
-                            voice = voices[i]
-                            if voice.startswith("[Clonada] "):
-                                voice_map[speaker] = {"type": "clone", "name": voice.replace("[Clonada] ", "")}
-                            elif voice.startswith("[Qwen] "):
-                                voice_map[speaker] = {"type": "qwen", "name": voice.replace("[Qwen] ", "")}
-                            else:
-                                voice_map[speaker] = {"type": "qwen", "name": voice}
+                        if i < len(voices):
+                            kind, name = _parse_voice(voices[i])
+                            if kind:
+                                voice_map[speaker] = {"type": kind, "name": name}
 
                     return voice_map, f"Voces asignadas: {len(voice_map)} speakers"
 
@@ -1067,94 +1227,59 @@ def build_ui():
                     """Muestra preview de la instruccion"""
                     if preset != "(personalizado)" and preset in PRESETS:
                         return PRESETS[preset]["instruct"]
-                    return build_instruct(emotion, style, pace, intensity, custom)
-
-                def apply_preset(preset):
-                    """Aplica un preset"""
-                    if preset == "(personalizado)":
-                        return "neutral", "conversacional", "normal", "normal", ""
-
-                    # Presets tienen configuraciones predefinidas
-                    preset_configs = {
-                        "dialogo_casual": ("neutral", "conversacional", "normal", "normal", ""),
-                        "entrevista": ("serio", "profesional", "normal", "normal", ""),
-                        "historia_emocionante": ("emocionado", "narracion", "normal", "normal", ""),
-                        "explicacion_clara": ("neutral", "explicativo", "pausado", "normal", ""),
-                        "debate_apasionado": ("enojado", "autoritario", "rapido", "fuerte", ""),
-                        "comedia": ("alegre", "conversacional", "normal", "normal", "con timing comico"),
-                        "drama": ("dramatico", "narracion", "pausado", "fuerte", ""),
-                        "misterio": ("misterioso", "susurro", "lento", "suave", ""),
-                        "motivacional": ("emocionado", "autoritario", "normal", "proyectado", ""),
-                        "meditacion": ("neutral", "intimo", "lento", "suave", ""),
-                        "noticia_urgente": ("serio", "noticia", "rapido", "proyectado", ""),
-                        "cuento_infantil": ("alegre", "infantil", "normal", "normal", ""),
-                        "confesion": ("triste", "intimo", "lento", "susurrado", ""),
-                        "celebracion": ("emocionado", "conversacional", "rapido", "fuerte", ""),
-                        "despedida": ("triste", "intimo", "pausado", "suave", ""),
-                    }
-
-                    if preset in preset_configs:
-                        return preset_configs[preset]
-                    return "neutral", "conversacional", "normal", "normal", ""
+                    return build_instruct(emotion, style, pace, intensity, custom=custom)
 
                 def generate_single_segment(
-                    segments, voice_map, generated_audios, seg_index,
+                    segments, voice_map, table_data, seg_index,
                     preset, emotion, style, pace, intensity, custom,
                     language, model_version
                 ):
                     """Genera audio para un segmento"""
+                    from src.tts_engine import AudioProcessor
+
                     if not segments or not voice_map:
-                        return segments, generated_audios, None, "Error: Configura voces primero", []
+                        return segments, None, "Error: Configura voces primero", table_data, table_data
 
                     seg_index = int(seg_index)
                     if seg_index >= len(segments):
-                        return segments, generated_audios, None, "Segmento invalido", []
+                        return segments, None, "Segmento invalido", table_data, table_data
 
                     seg = segments[seg_index]
                     speaker = seg["speaker"]
 
                     if speaker not in voice_map:
-                        return segments, generated_audios, None, f"Error: Sin voz para {speaker}", []
+                        return segments, None, f"Error: Sin voz para {speaker}", table_data, table_data
 
                     studio = get_studio()
-                    voice_info = voice_map[speaker]
 
-                    # Construir instruccion
-                    if preset != "(personalizado)" and preset in PRESETS:
-                        instruct = PRESETS[preset]["instruct"]
-                    else:
-                        instruct = build_instruct(emotion, style, pace, intensity, custom)
+                    # Instruccion resuelta desde los controles (el preview puede ir
+                    # atrasado); build_instruct memoizado, asi que es un acierto de cache
+                    instruct = update_instruct_preview(preset, emotion, style, pace, intensity, custom)
+
+                    # Mismos parametros que la ultima generacion y el WAV sigue en disco: reutilizarlo
+                    sig = _segment_sig(seg["text"], voice_map[speaker], instruct, language, model_version)
+                    output_path = _director_segment_path(seg_index)
+                    reuse = seg.get("sig") == sig and seg["generated"] and os.path.exists(output_path)
 
                     try:
-                        # Configurar segun tipo de voz
-                        ref_audio = None
-                        ref_text = None
-                        qwen_speaker = None
-
-                        if voice_info["type"] == "clone":
-                            voice_profile = studio.voice_library.get_voice(voice_info["name"])
-                            if voice_profile:
-                                ref_audio = voice_profile["audio_path"]
-                                ref_text = voice_profile["transcript"]
-                        else:
-                            qwen_speaker = voice_info["name"]
-
-                        # Generar
-                        studio.tts.load_model(model_version)
-                        audio, sr = studio.tts.generate(
-                            text=seg["text"],
-                            ref_audio_path=ref_audio,
-                            ref_text=ref_text,
-                            speaker=qwen_speaker,
-                            instruct=instruct,
-                            language=language
-                        )
+                        if not reuse:
+                            # Configurar segun tipo de voz
+                            ref_audio, ref_text, qwen_speaker = _resolve_voice(studio, voice_map[speaker])
+
+                            # Generar
+                            _ensure_model(studio, model_version, clone_only=bool(ref_audio and ref_text))
+                            audio, sr = studio.tts.generate(
+                                text=seg["text"],
+                                ref_audio_path=ref_audio,
+                                ref_text=ref_text,
+                                speaker=qwen_speaker,
+                                instruct=instruct,
+                                language=language
+                            )
 
-                        # Guardar audio
-                        output_dir = BASE_PATH / "output" / "director_segments"
-                        output_dir.mkdir(parents=True, exist_ok=True)
-                        output_path = str(output_dir / f"segment_{seg_index:03d}.wav")
-                        sf.write(output_path, audio, sr, format='WAV', subtype='PCM_16')
+                            # Guardar audio
+                            DIRECTOR_SEGMENTS_DIR.mkdir(parents=True, exist_ok=True)
+                            AudioProcessor.write_wav_pcm16(output_path, audio, sr)
 
                         # Actualizar estado
                         segments[seg_index]["emotion"] = emotion
@@ -1163,51 +1288,64 @@ def build_ui():
                         segments[seg_index]["intensity"] = intensity
                         segments[seg_index]["custom"] = custom
                         segments[seg_index]["generated"] = True
+                        segments[seg_index]["sig"] = sig
 
-                        generated_audios[seg_index] = output_path
-
-                        # Actualizar tabla
-                        table_data = [
-                            [
-                                s["index"],
-                                s["speaker"],
-                                s["text"][:40] + "...",
-                                "Listo" if s["generated"] else "Pendiente",
-                                s["emotion"]
-                            ]
-                            for s in segments
-                        ]
+                        # Actualizar solo la fila del segmento
+                        table_data[seg_index] = [seg_index, speaker, seg["preview"], "Listo", emotion]
 
                         return (
                             segments,
-                            generated_audios,
                             output_path,
-                            f"Segmento {seg_index} generado",
+                            f"Segmento {seg_index} sin cambios (audio reutilizado)" if reuse
+                            else f"Segmento {seg_index} generado",
+                            table_data,
                             table_data
                         )
 
                     except Exception as e:
-                        return segments, generated_audios, None, f"Error: {str(e)}", []
+                        return segments, None, f"Error: {str(e)}", table_data, table_data
 
                 def generate_all_segments(
-                    segments, voice_map, generated_audios,
+                    segments, voice_map, table_data,
                     language, model_version, progress=gr.Progress()
                 ):
                     """Genera todos los segmentos pendientes"""
+                    from src.tts_engine import AudioProcessor
+
                     if not segments or not voice_map:
-                        return segments, generated_audios, "Error: Configura voces primero", []
+                        return segments, "Error: Configura voces primero", table_data, table_data
 
                     studio = get_studio()
-                    studio.tts.load_model(model_version)
 
-                    output_dir = BASE_PATH / "output" / "director_segments"
-                    output_dir.mkdir(parents=True, exist_ok=True)
+                    DIRECTOR_SEGMENTS_DIR.mkdir(parents=True, exist_ok=True)
 
                     total = len(segments)
 
-                    for i, seg in enumerate(segments):
-                        progress(i / total, f"Generando {i+1}/{total}...")
+                    # Voces resueltas una sola vez: voice_map no cambia durante la corrida
+                    resolved = {
+                        speaker: _resolve_voice(studio, voice_info)
+                        for speaker, voice_info in voice_map.items()
+                    }
+                    _ensure_model(
+                        studio, model_version,
+                        clone_only=all(ref_audio and ref_text for ref_audio, ref_text, _ in resolved.values())
+                    )
+
+                    # Referencias de clonacion codificadas una vez antes del bucle;
+                    # cada generate() posterior reutiliza el prompt cacheado. Solo si el
+                    # modelo cargado ya clona: cambiar de modelo vacia la cache.
+                    if "voice_clone" in MODEL_CAPABILITIES.get(studio.tts.current_model_name, []):
+                        for ref_audio, ref_text, _ in set(resolved.values()):
+                            if ref_audio and ref_text:
+                                studio.tts.encode_reference(ref_audio, ref_text)
+
+                    # La escritura de cada WAV corre en el pool de I/O mientras la GPU genera el siguiente
+                    pending_writes = {}
 
+                    # Pendientes agrupados por (speaker, instruccion): cada grupo comparte
+                    # voz y estilo, asi que sus textos cortos van en lotes a generate_batch
+                    groups = defaultdict(list)
+                    for i, seg in enumerate(segments):
                         if seg["generated"]:
                             continue  # Ya generado
 
@@ -1215,100 +1353,140 @@ def build_ui():
                         if speaker not in voice_map:
                             continue
 
-                        voice_info = voice_map[speaker]
-
                         # Construir instruccion
                         instruct = build_instruct(
                             seg.get("emotion", "neutral"),
                             seg.get("style", "conversacional"),
                             seg.get("pace", "normal"),
                             seg.get("intensity", "normal"),
-                            seg.get("custom", "")
+                            custom=seg.get("custom", "")
+                        )
+                        groups[(speaker, instruct)].append(i)
+
+                    batches = []
+                    for (speaker, instruct), indices in groups.items():
+                        short = [i for i in indices if len(segments[i]["text"]) <= DIRECTOR_BATCH_MAX_CHARS]
+                        batches.extend(
+                            (speaker, instruct, short[k:k + DIRECTOR_BATCH_SIZE])
+                            for k in range(0, len(short), DIRECTOR_BATCH_SIZE)
                         )
+                        batches.extend(
+                            (speaker, instruct, [i]) for i in indices
+                            if len(segments[i]["text"]) > DIRECTOR_BATCH_MAX_CHARS
+                        )
+
+                    done = 0
+                    for speaker, instruct, indices in batches:
+                        progress(done / total, f"Generando {done+1}/{total}...")
+                        done += len(indices)
 
                         try:
-                            ref_audio = None
-                            ref_text = None
-                            qwen_speaker = None
-
-                            if voice_info["type"] == "clone":
-                                voice_profile = studio.voice_library.get_voice(voice_info["name"])
-                                if voice_profile:
-                                    ref_audio = voice_profile["audio_path"]
-                                    ref_text = voice_profile["transcript"]
+                            ref_audio, ref_text, qwen_speaker = resolved[speaker]
+
+                            if len(indices) > 1:
+                                audios, sr = studio.tts.generate_batch(
+                                    [segments[i]["text"] for i in indices],
+                                    ref_audio_path=ref_audio,
+                                    ref_text=ref_text,
+                                    speaker=qwen_speaker,
+                                    instruct=instruct,
+                                    language=language
+                                )
                             else:
-                                qwen_speaker = voice_info["name"]
-
-                            audio, sr = studio.tts.generate(
-                                text=seg["text"],
-                                ref_audio_path=ref_audio,
-                                ref_text=ref_text,
-                                speaker=qwen_speaker,
-                                instruct=instruct,
-                                language=language
-                            )
+                                audio, sr = studio.tts.generate(
+                                    text=segments[indices[0]]["text"],
+                                    ref_audio_path=ref_audio,
+                                    ref_text=ref_text,
+                                    speaker=qwen_speaker,
+                                    instruct=instruct,
+                                    language=language
+                                )
+                                audios = [audio]
+
+                            for i, audio in zip(indices, audios):
+                                pending_writes[i] = (
+                                    _DIRECTOR_IO_POOL.submit(
+                                        AudioProcessor.write_wav_pcm16, _director_segment_path(i), audio, sr
+                                    ),
+                                    _segment_sig(
+                                        segments[i]["text"], voice_map[speaker], instruct,
+                                        language, model_version
+                                    )
+                                )
 
-                            output_path = str(output_dir / f"segment_{i:03d}.wav")
-                            sf.write(output_path, audio, sr, format='WAV', subtype='PCM_16')
+                        except Exception as e:
+                            print(f"Error en segmentos {indices}: {e}")
 
+                    # result() espera a cada escritura pendiente
+                    for i, (future, sig) in pending_writes.items():
+                        try:
+                            future.result()
                             segments[i]["generated"] = True
-                            generated_audios[i] = output_path
-
+                            segments[i]["sig"] = sig
+                            table_data[i][3] = "Listo"
                         except Exception as e:
-                            print(f"Error en segmento {i}: {e}")
+                            print(f"Error guardando segmento {i}: {e}")
 
                     progress(1.0, "Completado")
 
-                    # Actualizar tabla
-                    table_data = [
-                        [
-                            s["index"],
-                            s["speaker"],
-                            s["text"][:40] + "...",
-                            "Listo" if s["generated"] else "Pendiente",
-                            s["emotion"]
-                        ]
-                        for s in segments
-                    ]
-
                     generated_count = sum(1 for s in segments if s["generated"])
                     return (
                         segments,
-                        generated_audios,
                         f"Generados {generated_count}/{total} segmentos",
+                        table_data,
                         table_data
                     )
 
-                def join_all_audios(segments, generated_audios):
+                def join_all_audios(segments):
                     """Une todos los audios generados"""
-                    if not generated_audios:
-                        return None, "No hay audios generados"
-
-                    # Ordenar por indice
-                    sorted_indices = sorted(generated_audios.keys())
+                    import numpy as np
+                    import soundfile as sf
+                    from src.tts_engine import WavAppender
 
-                    all_audio = []
-                    sample_rate = 24000
+                    # Recorrido directo de los segmentos: ya en orden de indice, sin sort
+                    generated_indices = [i for i, s in enumerate(segments) if s["generated"]]
+                    if not generated_indices:
+                        return None, "No hay audios generados"
 
-                    for idx in sorted_indices:
-                        audio_path = generated_audios[idx]
-                        if os.path.exists(audio_path):
-                            audio, sr = sf.read(audio_path)
-                            sample_rate = sr
-                            all_audio.append(audio)
-                            # Pausa entre segmentos
-                            pause = np.zeros(int(sr * 0.3))
-                            all_audio.append(pause)
+                    # sf.info ya falla si el WAV no esta: sin stat previo por archivo
+                    audio_paths = []
+                    rates = set()
+                    for path in map(_director_segment_path, generated_indices):
+                        try:
+                            rates.add(sf.info(path).samplerate)
+                        except RuntimeError:
+                            continue
+                        audio_paths.append(path)
 
-                    if not all_audio:
+                    if not audio_paths:
                         return None, "No se encontraron audios"
 
-                    final_audio = np.concatenate(all_audio)
+                    # Copia de bloques PCM16 al archivo final: sin decodificar a float
+                    # ni armar todo el podcast en memoria. Al copiar muestras crudas,
+                    # todos los segmentos deben compartir la tasa de muestreo.
+                    if len(rates) > 1:
+                        return None, f"Error: segmentos con tasas de muestreo distintas {sorted(rates)}; regeneralos"
+                    sample_rate = rates.pop()
+                    pause = _director_pause(sample_rate)
+
+                    # Un unico buffer int16 reutilizado para todos los bloques de todos los
+                    # segmentos (los WAV del Director son mono)
+                    block = np.empty(1 << 16, dtype=np.int16)
 
                     output_path = str(BASE_PATH / "output" / "director_final.wav")
-                    sf.write(output_path, final_audio, sample_rate, format='WAV', subtype='PCM_16')
+                    with WavAppender(output_path, sample_rate) as writer:
+                        for audio_path in audio_paths:
+                            with sf.SoundFile(audio_path) as f:
+                                while True:
+                                    frames = f.read(out=block)
+                                    if not len(frames):
+                                        break
+                                    writer.append_pcm16(frames)
+                            # Pausa entre segmentos
+                            writer.append_pcm16(pause)
 
-                    return output_path, f"Podcast unido: {len(sorted_indices)} segmentos, {len(final_audio)/sample_rate:.1f}s"
+                    duration = writer.data_size / 2 / sample_rate
+                    return output_path, f"Podcast unido: {len(audio_paths)} segmentos, {duration:.1f}s"
 
                 # === Conectar eventos ===
 
@@ -1323,6 +1501,7 @@ def build_ui():
                         segment_selector,
                         segment_total,
                         segments_table,
+                        director_table_state,
                         segment_speaker,
                         segment_text
                     ]
@@ -1344,13 +1523,18 @@ def build_ui():
                     ]
                 )
 
-                # Actualizar preview de instruccion
-                for control in [preset_selector, emotion_selector, style_selector, pace_selector, intensity_selector, custom_instruct]:
-                    control.change(
-                        update_instruct_preview,
-                        inputs=[preset_selector, emotion_selector, style_selector, pace_selector, intensity_selector, custom_instruct],
-                        outputs=[instruct_preview]
-                    )
+                # Actualizar preview de instruccion (build_instruct esta memoizado,
+                # asi que seguir cada tecla del texto libre es barato)
+                gr.on(
+                    triggers=[
+                        preset_selector.change, emotion_selector.change, style_selector.change,
+                        pace_selector.change, intensity_selector.change, custom_instruct.change,
+                    ],
+                    fn=update_instruct_preview,
+                    inputs=[preset_selector, emotion_selector, style_selector, pace_selector, intensity_selector, custom_instruct],
+                    outputs=[instruct_preview],
+                    queue=False
+                )
 
                 preset_selector.change(
                     apply_preset,
@@ -1361,29 +1545,37 @@ def build_ui():
                 generate_segment_btn.click(
                     generate_single_segment,
                     inputs=[
-                        director_segments, director_voice_map, director_generated_audios,
-                        segment_selector, preset_selector, emotion_selector, style_selector,
+                        director_segments, director_voice_map,
+                        director_table_state, segment_selector, preset_selector, emotion_selector, style_selector,
                         pace_selector, intensity_selector, custom_instruct,
                         director_language, director_model
                     ],
                     outputs=[
-                        director_segments, director_generated_audios,
-                        segment_audio_preview, director_status, segments_table
-                    ]
+                        director_segments,
+                        segment_audio_preview, director_status, segments_table,
+                        director_table_state
+                    ],
+                    concurrency_limit=1,
+                    concurrency_id=GPU_CONCURRENCY_ID
                 )
 
                 generate_all_btn.click(
                     generate_all_segments,
                     inputs=[
-                        director_segments, director_voice_map, director_generated_audios,
-                        director_language, director_model
+                        director_segments, director_voice_map,
+                        director_table_state, director_language, director_model
                     ],
-                    outputs=[director_segments, director_generated_audios, director_status, segments_table]
+                    outputs=[
+                        director_segments, director_status,
+                        segments_table, director_table_state
+                    ],
+                    concurrency_limit=1,
+                    concurrency_id=GPU_CONCURRENCY_ID
                 )
 
                 director_join_btn.click(
                     join_all_audios,
-                    inputs=[director_segments, director_generated_audios],
+                    inputs=[director_segments],
                     outputs=[director_final_audio, director_status]
                 )
 
@@ -1435,7 +1627,16 @@ def build_ui():
                     msg = unload_models()
                     return gr.update(value=msg, visible=True)
 
-                gpu_cleanup_btn.click(cleanup_gpu, outputs=[gpu_status])
+                gpu_cleanup_btn.click(
+                    cleanup_gpu, outputs=[gpu_status],
+                    concurrency_limit=1, concurrency_id=GPU_CONCURRENCY_ID
+                )
+
+        # Al cargar la pagina, incluir las voces clonadas que no estaban listas al construir la UI
+        app.load(get_voices_for_language, inputs=[proj_language], outputs=[proj_voice])
+
+    # Los handlers livianos van con queue=False; los de GPU comparten GPU_CONCURRENCY_ID
+    app.queue(default_concurrency_limit=2, max_size=32)
 
     return app
 
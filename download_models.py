@@ -1,24 +1,198 @@
 """
 Script para descargar los modelos de Qwen3-TTS
 Ejecutar una vez antes de usar la aplicación
+
+Opcional: `pip install hf_transfer` para descargar cada archivo grande
+con varias conexiones en paralelo (se activa solo si esta instalado)
 """
+import importlib.util
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, Optional
+
+import orjson
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Repo del Hub y carpeta local donde se descarga"""
+    repo_id: str
+    size_mib: int  # Tamaño aproximado: las descargas grandes se lanzan primero
+    local_name: str = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "local_name", self.repo_id.split("/")[-1])
+
 
 # Modelos a descargar
-MODELS = [
-    "Qwen/Qwen3-TTS-Tokenizer-12Hz",      # Codec de audio (requerido)
-    "Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice",  # TTS principal con clonación
-    "Qwen/Qwen3-TTS-12Hz-0.6B-CustomVoice",  # TTS ligero
-    "Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign",  # TTS con diseño de voz
-    "Qwen/Qwen3-ASR-1.7B",                    # Transcripción automática
-]
+MODELS = (
+    ModelSpec("Qwen/Qwen3-TTS-Tokenizer-12Hz", 700),          # Codec de audio (requerido)
+    ModelSpec("Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice", 4300),  # TTS principal con clonación
+    ModelSpec("Qwen/Qwen3-TTS-12Hz-0.6B-CustomVoice", 2300),  # TTS ligero
+    ModelSpec("Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign", 4300),  # TTS con diseño de voz
+    ModelSpec("Qwen/Qwen3-ASR-1.7B", 4500),                   # Transcripción automática
+)
+
+# Repos descargados a la vez: cada uno es I/O de red independiente
+DOWNLOAD_WORKERS = 5
+
+# Archivos descargados a la vez dentro de cada repo (max_workers de snapshot_download)
+FILE_WORKERS_PER_REPO = 8
+
+# Reintentos por repo ante cortes de red; snapshot_download retoma los archivos
+# .incomplete desde el byte donde quedaron (peticiones Range), no desde cero
+DOWNLOAD_RETRIES = 3
+RETRY_BACKOFF_S = 5
+
+# Lista de archivos y tamaños del repo guardada junto al modelo: permite
+# verificar la descarga sin red (--check)
+MANIFEST_NAME = ".manifest.json"
+
+
+def _enable_fast_transfer() -> bool:
+    """
+    Activa los clientes rapidos de huggingface_hub; debe correr antes de importarlo
+
+    hf_transfer baja cada archivo grande con varias peticiones Range en
+    paralelo. Retorna False si no esta instalado (una conexion por archivo).
+    """
+    # Repos servidos por Xet: mas rangos concurrentes por archivo
+    os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+    if importlib.util.find_spec("hf_transfer") is None:
+        return False
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    return True
+
+
+def _configure_http_pool():
+    """
+    Pool de conexiones keep-alive del cliente HTTP del Hub
+
+    huggingface_hub ya reutiliza una sesion por hilo; el pool por defecto de
+    requests (10 conexiones) se queda corto con FILE_WORKERS_PER_REPO hilos
+    pidiendo al mismo host y descarta conexiones TLS que podria reutilizar.
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from huggingface_hub import configure_http_backend
+    except ImportError:
+        # huggingface_hub >= 1.0 usa httpx y ya no expone configure_http_backend
+        return
+
+    pool_size = DOWNLOAD_WORKERS * FILE_WORKERS_PER_REPO
+
+    def backend_factory() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    configure_http_backend(backend_factory=backend_factory)
+
+
+def _fetch_manifest(model_id: str) -> Optional[Dict[str, Optional[int]]]:
+    """Archivos del repo en el Hub -> tamaño en bytes (None si no hay red)"""
+    from huggingface_hub import HfApi
+
+    try:
+        info = HfApi().model_info(model_id, files_metadata=True)
+    except Exception as e:
+        print(f"  No se pudo consultar {model_id}: {e}")
+        return None
+    return {s.rfilename: s.size for s in info.siblings}
+
+
+def _load_manifest(local_path: Path) -> Optional[Dict[str, Optional[int]]]:
+    """Manifiesto guardado tras la ultima descarga completa"""
+    try:
+        return orjson.loads((local_path / MANIFEST_NAME).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _save_manifest(local_path: Path, manifest: Dict[str, Optional[int]]):
+    (local_path / MANIFEST_NAME).write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+
+def _is_repo_complete(local_path: Path, manifest: Dict[str, Optional[int]]) -> bool:
+    """Todos los archivos del manifiesto en disco y con el tamaño esperado"""
+    for filename, size in manifest.items():
+        try:
+            stat = (local_path / filename).stat()
+        except OSError:
+            return False
+        if size is not None and stat.st_size != size:
+            return False
+    return True
+
+
+def _present_model_dirs(models_dir: Path) -> set:
+    """Nombres de las carpetas no vacias en models/ (un solo scandir del directorio)"""
+    try:
+        with os.scandir(models_dir) as entries:
+            dirs = [entry.path for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return set()
+
+    present = set()
+    for path in dirs:
+        with os.scandir(path) as children:
+            if next(children, None) is not None:
+                present.add(os.path.basename(path))
+    return present
+
+
+def _model_status(local_path: Path, present: bool) -> str:
+    """OK / INCOMPLETO / FALTA, sin red"""
+    if not present:
+        return "FALTA"
+    manifest = _load_manifest(local_path)
+    if manifest is None:
+        # Descargado antes de que existiera el manifiesto: no se puede verificar
+        return "OK"
+    return "OK" if _is_repo_complete(local_path, manifest) else "INCOMPLETO"
+
+
+def _sync_model(snapshot_download, model_id: str, local_path: Path, present: bool) -> str:
+    """Descarga un repo si falta o esta incompleto; retorna el resultado para mostrar"""
+    # Una carpeta no vacia puede ser una descarga interrumpida: se compara
+    # contra la lista de archivos del Hub (o la ultima guardada, sin red)
+    manifest = _fetch_manifest(model_id) or _load_manifest(local_path)
+    if present and (manifest is None or _is_repo_complete(local_path, manifest)):
+        return f"Ya existe en: {local_path}"
+
+    for attempt in range(1, DOWNLOAD_RETRIES + 1):
+        try:
+            snapshot_download(
+                repo_id=model_id,
+                local_dir=str(local_path),
+                local_dir_use_symlinks=False,
+                max_workers=FILE_WORKERS_PER_REPO
+            )
+            break
+        except Exception as e:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            wait = RETRY_BACKOFF_S * 2 ** (attempt - 1)
+            print(f"  {model_id}: {e}; reintento {attempt}/{DOWNLOAD_RETRIES - 1} en {wait}s")
+            time.sleep(wait)
+
+    if manifest is not None:
+        _save_manifest(local_path, manifest)
+    return f"Completado{' (descarga reanudada)' if present else ''}: {local_path}"
 
 
 def download_models():
     """Descarga todos los modelos necesarios"""
+    fast_transfer = _enable_fast_transfer()
     from huggingface_hub import snapshot_download
+    _configure_http_pool()
 
     models_dir = Path(__file__).parent / "models"
     models_dir.mkdir(exist_ok=True)
@@ -27,32 +201,44 @@ def download_models():
     print("DESCARGA DE MODELOS QWEN3-TTS")
     print("=" * 60)
     print(f"\nDirectorio de modelos: {models_dir}")
-    print(f"Modelos a descargar: {len(MODELS)}\n")
+    print(f"Modelos a descargar: {len(MODELS)}")
+    if not fast_transfer:
+        print("Sugerencia: `pip install hf_transfer` descarga los pesos grandes con varias conexiones")
+    print()
 
-    for i, model_id in enumerate(MODELS, 1):
-        model_name = model_id.split("/")[-1]
-        local_path = models_dir / model_name
+    # Cada tarea consulta el manifiesto de su repo y descarga si hace falta: las
+    # consultas al Hub de unos repos se solapan con las descargas de otros
+    present = _present_model_dirs(models_dir)
+    executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+    # El mas grande primero: los chicos rellenan los hilos al final y ninguna
+    # descarga larga queda rezagada sola
+    futures = {}
+    for spec in sorted(MODELS, key=lambda m: -m.size_mib):
+        future = executor.submit(
+            _sync_model, snapshot_download, spec.repo_id,
+            models_dir / spec.local_name, spec.local_name in present
+        )
+        futures[future] = spec.repo_id
 
-        print(f"\n[{i}/{len(MODELS)}] {model_id}")
-        print("-" * 40)
+    try:
+        for i, future in enumerate(as_completed(futures), 1):
+            model_id = futures[future]
+            print(f"\n[{i}/{len(MODELS)}] {model_id}")
+            print("-" * 40)
+            try:
+                print(f"  {future.result()}")
 
-        if local_path.exists() and any(local_path.iterdir()):
-            print(f"  Ya existe en: {local_path}")
-            continue
+            except Exception as e:
+                print(f"  ERROR: {e}")
+                print("  Puedes descargarlo manualmente desde:")
+                print(f"  https://huggingface.co/{model_id}")
+    except KeyboardInterrupt:
+        # Los hilos de descarga no se pueden interrumpir: cancelar lo pendiente y salir ya
+        print("\nDescarga cancelada")
+        executor.shutdown(wait=False, cancel_futures=True)
+        os._exit(1)
 
-        try:
-            print(f"  Descargando...")
-            snapshot_download(
-                repo_id=model_id,
-                local_dir=str(local_path),
-                local_dir_use_symlinks=False
-            )
-            print(f"  Completado: {local_path}")
-
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            print("  Puedes descargarlo manualmente desde:")
-            print(f"  https://huggingface.co/{model_id}")
+    executor.shutdown()
 
     print("\n" + "=" * 60)
     print("DESCARGA COMPLETADA")
@@ -67,12 +253,10 @@ def check_models():
     print("\nEstado de modelos:")
     print("-" * 40)
 
-    for model_id in MODELS:
-        model_name = model_id.split("/")[-1]
-        local_path = models_dir / model_name
-
-        status = "OK" if (local_path.exists() and any(local_path.iterdir())) else "FALTA"
-        print(f"  [{status}] {model_name}")
+    present = _present_model_dirs(models_dir)
+    for spec in MODELS:
+        status = _model_status(models_dir / spec.local_name, spec.local_name in present)
+        print(f"  [{status}] {spec.local_name}")
 
 
 if __name__ == "__main__":
@@ -4,6 +4,10 @@ Usa prompts en INGLES (el modelo los entiende mejor) incluso para contenido en e
 Incluye emociones con 3 niveles de intensidad, modalidades "swipe", y analisis automatico de texto.
 """
 import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Tuple, Dict
 
 # ── Emociones con 3 niveles de intensidad (prompts en ingles) ──
@@ -196,6 +200,28 @@ PRESETS = {
     },
 }
 
+# Controles de la UI (emocion, estilo, ritmo, intensidad, custom) que aplica cada preset
+PRESET_CONTROLS = MappingProxyType({
+    "dialogo_casual":       ("neutral",    "conversational", "normal",   "normal",    ""),
+    "entrevista":           ("confidence", "professional",   "normal",   "normal",    ""),
+    "historia_emocionante": ("excitement", "narration",      "normal",   "normal",    ""),
+    "explicacion_clara":    ("neutral",    "explanatory",    "dramatic", "normal",    ""),
+    "debate_apasionado":    ("anger",      "authoritative",  "fast",     "loud",      ""),
+    "comedia":              ("joy",        "conversational", "normal",   "normal",    "with comedic timing"),
+    "drama":                ("drama",      "narration",      "dramatic", "loud",      ""),
+    "misterio":             ("mystery",    "whisper",        "slow",     "soft",      ""),
+    "motivacional":         ("excitement", "authoritative",  "normal",   "projected", ""),
+    "meditacion":           ("neutral",    "intimate",       "slow",     "soft",      ""),
+    "noticia_urgente":      ("confidence", "news",           "fast",     "projected", ""),
+    "cuento_infantil":      ("joy",        "playful",        "normal",   "normal",    ""),
+    "confesion":            ("sadness",    "intimate",       "slow",     "whispered", ""),
+    "celebracion":          ("excitement", "conversational", "fast",     "loud",      ""),
+    "despedida":            ("sadness",    "intimate",       "dramatic", "soft",      ""),
+})
+DEFAULT_PRESET_CONTROLS = ("neutral", "conversational", "normal", "normal", "")
+
+assert PRESET_CONTROLS.keys() == PRESETS.keys(), "PRESET_CONTROLS y PRESETS desincronizados"
+
 # ── Analisis automatico de texto ──
 
 EMOTION_KEYWORDS = {
@@ -233,6 +259,45 @@ PUNCTUATION_CUES = {
     "?":   {"emotion": "curiosity",  "intensity_boost": 0.1},
 }
 
+# Signos de PUNCTUATION_CUES en una sola pasada; los compuestos van primero
+# para que "!!" no cuente ademas como dos "!"
+PUNCTUATION_RE = re.compile(r'!!|\?!|\.\.\.|[!?]')
+
+# Separador de frases para estimar el ritmo
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+
+def _fold(text: str) -> str:
+    """
+    Minusculas sin tildes ni cedillas: "Increíble" -> "increible", "ameaça" -> "ameaca"
+
+    Las palabras clave estan escritas sin acentos; texto y palabras pasan por
+    la misma normalizacion para que coincidan.
+    """
+    decomposed = unicodedata.normalize("NFD", text.casefold())
+    if decomposed.isascii():
+        return decomposed
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _build_keyword_index(lang: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    Indice invertido palabra clave -> emociones (una busqueda por palabra distinta)
+
+    Las palabras se normalizan aqui, una vez, con la misma _fold que analyze_text
+    aplica al texto; una emocion no se repite por palabra.
+    """
+    index: Dict[str, List[str]] = {}
+    for emotion, kw_dict in EMOTION_KEYWORDS.items():
+        for word in kw_dict.get(lang, []):
+            emotions = index.setdefault(_fold(word), [])
+            if emotion not in emotions:
+                emotions.append(emotion)
+    return tuple((word, tuple(emotions)) for word, emotions in index.items())
+
+
+KEYWORD_INDEX = MappingProxyType({lang: _build_keyword_index(lang) for lang in ("es", "pt")})
+
 
 def analyze_text(text: str, language: str = "es") -> Dict:
     """
@@ -249,31 +314,42 @@ def analyze_text(text: str, language: str = "es") -> Dict:
     if lang not in ("es", "pt"):
         lang = "es"
 
-    text_lower = text.lower()
+    # Copia: el resultado cacheado es compartido entre llamadas
+    return dict(_analyze_text(text, lang))
 
-    # 1. Scoring por palabras clave
-    emotion_scores: Dict[str, float] = {}
-    for emotion, kw_dict in EMOTION_KEYWORDS.items():
-        score = 0.0
-        for word in kw_dict.get(lang, []):
-            if word in text_lower:
-                score += 0.3
-        emotion_scores[emotion] = score
+
+@lru_cache(maxsize=256)
+def _analyze_text(text: str, lang: str) -> Dict:
+    """Cuerpo de analyze_text, memoizado por (texto, idioma normalizado)"""
+    # Una sola normalizacion del texto para todas las palabras clave
+    text_folded = _fold(text)
+
+    # 1. Scoring por palabras clave (orden de EMOTION_KEYWORDS para desempates)
+    emotion_scores: Dict[str, float] = dict.fromkeys(EMOTION_KEYWORDS, 0.0)
+    for word, emotions in KEYWORD_INDEX[lang]:
+        if word in text_folded:
+            for emotion in emotions:
+                emotion_scores[emotion] += 0.3
 
     # 2. Scoring por puntuacion
-    punct_boost_emotion = None
+    punct_counts = Counter(PUNCTUATION_RE.findall(text))
     for punct, cue in PUNCTUATION_CUES.items():
-        count = text.count(punct)
+        count = punct_counts[punct]
         if count > 0:
             emo = cue["emotion"]
             boost = cue["intensity_boost"] * min(count, 3)
             emotion_scores[emo] = emotion_scores.get(emo, 0) + boost
-            if punct_boost_emotion is None:
-                punct_boost_emotion = emo
 
     # 3. Ritmo por longitud promedio de frases
-    sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
-    avg_length = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
+    # Una frase cuenta si tiene alguna palabra (equivale a s.strip() no vacio)
+    total_words = 0
+    n_sentences = 0
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        words = len(sentence.split())
+        if words:
+            total_words += words
+            n_sentences += 1
+    avg_length = total_words / max(n_sentences, 1)
 
     if avg_length < 8:
         rhythm = "fast pace"
@@ -321,6 +397,7 @@ def analyze_text(text: str, language: str = "es") -> Dict:
 
 # ── Funciones de construccion de instruct ──
 
+@lru_cache(maxsize=1024)
 def build_instruct(
     emotion: str = "neutral",
     style: str = "conversational",
@@ -364,6 +441,13 @@ def build_instruct(
     return instruct
 
 
+# Cache de build_instruct precargado con los controles que aplica cada preset
+# (misma forma de llamada que la UI: cuatro posicionales + custom=)
+for _controls in (DEFAULT_PRESET_CONTROLS, *PRESET_CONTROLS.values()):
+    build_instruct(*_controls[:4], custom=_controls[4])
+del _controls
+
+
 def get_preset_instruct(preset_name: str) -> str:
     """Obtiene la instruccion de un preset predefinido"""
     if preset_name in PRESETS:
@@ -378,32 +462,37 @@ def get_modality_instruct(modality_name: str) -> str:
     return ""
 
 
-def list_emotions() -> List[str]:
-    return list(EMOTIONS.keys())
+# ── Exportar listas para UI ──
+# Tuplas construidas una vez al importar: las funciones list_* las retornan tal cual
 
+EMOTION_CHOICES = tuple(EMOTIONS)
+STYLE_CHOICES = tuple(SPEAKING_STYLES)
+PACE_CHOICES = tuple(PACE)
+INTENSITY_CHOICES = tuple(INTENSITY)
+PRESET_CHOICES = ("(custom)",) + tuple(PRESETS)
+MODALITY_CHOICES = tuple(MODALITIES)
+INTENSITY_LEVELS = ("low", "mid", "high")
 
-def list_styles() -> List[str]:
-    return list(SPEAKING_STYLES.keys())
+PRESET_LIST = tuple((name, data["description"]) for name, data in PRESETS.items())
+# Dicts planos (serializables con orjson); compartidos: no modificarlos
+MODALITY_LIST = tuple(
+    {"name": name, "label": data["label"], "icon": data["icon"],
+     "description": data["description"], "instruct": data["instruct"]}
+    for name, data in MODALITIES.items()
+)
 
 
-def list_presets() -> List[Tuple[str, str]]:
-    return [(name, data["description"]) for name, data in PRESETS.items()]
+def list_emotions() -> Tuple[str, ...]:
+    return EMOTION_CHOICES
 
 
-def list_modalities() -> List[Dict]:
-    return [
-        {"name": name, "label": data["label"], "icon": data["icon"],
-         "description": data["description"], "instruct": data["instruct"]}
-        for name, data in MODALITIES.items()
-    ]
+def list_styles() -> Tuple[str, ...]:
+    return STYLE_CHOICES
 
 
-# ── Exportar listas para UI ──
+def list_presets() -> Tuple[Tuple[str, str], ...]:
+    return PRESET_LIST
+
 
-EMOTION_CHOICES = list(EMOTIONS.keys())
-STYLE_CHOICES = list(SPEAKING_STYLES.keys())
-PACE_CHOICES = list(PACE.keys())
-INTENSITY_CHOICES = list(INTENSITY.keys())
-PRESET_CHOICES = ["(custom)"] + list(PRESETS.keys())
-MODALITY_CHOICES = list(MODALITIES.keys())
-INTENSITY_LEVELS = ["low", "mid", "high"]
+def list_modalities() -> Tuple[Dict, ...]:
+    return MODALITY_LIST
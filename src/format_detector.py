@@ -3,16 +3,24 @@ Deteccion automatica de formato de contenido para el Editor Universal.
 Detecta si el contenido es texto plano, script de podcast, o JSON de audiolibro.
 """
 import re
-import json
+import orjson
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple
 
 
 # Mismo patron que PodcastProcessor.PATTERN
 PODCAST_PATTERN = r"\[(\d{1,2}:\d{2})\]\s*(\w+):\s*(.+)"
+PODCAST_RE = re.compile(PODCAST_PATTERN)
+
+# El formato podcast siempre es identificable desde el inicio del texto
+DETECT_PREFIX_CHARS = 4096
 
 # Claves que indican formato de audiolibro JSON
-AUDIOBOOK_KEYS = {"tts_version", "reading_version", "content"}
+AUDIOBOOK_KEYS = frozenset({"tts_version", "reading_version", "content"})
+AUDIOBOOK_KEY_RE = re.compile(r'"(?:tts_version|reading_version|content)"\s*:')
+
+# Un audiolibro JSON declara sus claves al inicio: basta escanear este prefijo
+JSON_HEAD_CHARS = 65536
 
 
 def detect_format(content: str) -> str:
@@ -25,23 +33,28 @@ def detect_format(content: str) -> str:
     Returns:
         "audiobook_json" | "podcast_script" | "plain_text"
     """
-    stripped = content.strip()
+    # Solo se recorta el prefijo: strip() del documento entero copiaria
+    # archivos de varios MB solo para clasificarlos
+    head = content[:JSON_HEAD_CHARS].lstrip() or content.lstrip()[:JSON_HEAD_CHARS]
 
-    if not stripped:
+    if not head:
         return "plain_text"
 
-    # Intentar parsear como JSON
-    if stripped.startswith("{"):
+    # JSON: buscar las claves en el prefijo; parseo completo solo si no aparecen
+    if head.startswith("{"):
+        if AUDIOBOOK_KEY_RE.search(head):
+            return "audiobook_json"
         try:
-            data = json.loads(stripped)
-            if isinstance(data, dict) and AUDIOBOOK_KEYS & set(data.keys()):
+            data = orjson.loads(content)
+            if isinstance(data, dict) and not AUDIOBOOK_KEYS.isdisjoint(data):
                 return "audiobook_json"
-        except (json.JSONDecodeError, ValueError):
+        except ValueError:
             pass
 
     # Verificar patron de podcast: al menos 2 lineas con formato [HH:MM] Speaker: text
-    matches = re.findall(PODCAST_PATTERN, stripped)
-    if len(matches) >= 2:
+    # (solo sobre el prefijo y cortando en el segundo match)
+    matches = PODCAST_RE.finditer(head, 0, DETECT_PREFIX_CHARS)
+    if next(matches, None) is not None and next(matches, None) is not None:
         return "podcast_script"
 
     return "plain_text"
@@ -62,15 +75,7 @@ def detect_from_file(file_path: str) -> Tuple[str, str]:
     with open(path, "r", encoding="utf-8") as f:
         content = f.read()
 
-    # Si la extension es .json, intentar primero como audiobook
-    if path.suffix.lower() == ".json":
-        try:
-            data = json.loads(content)
-            if isinstance(data, dict) and AUDIOBOOK_KEYS & set(data.keys()):
-                return "audiobook_json", content
-        except (json.JSONDecodeError, ValueError):
-            pass
-
+    # .json y .txt pasan por la misma deteccion (escaneo del prefijo JSON)
     fmt = detect_format(content)
     return fmt, content
 
@@ -115,6 +120,5 @@ def extract_speakers(content: str) -> list:
     Returns:
         Lista ordenada de nombres de speakers
     """
-    matches = re.findall(PODCAST_PATTERN, content)
-    speakers = sorted(set(m[1] for m in matches))
+    speakers = sorted({m.group(2) for m in PODCAST_RE.finditer(content)})
     return speakers
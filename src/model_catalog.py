@@ -0,0 +1,32 @@
+"""
+Catalogo de modelos y speakers de Qwen3-TTS
+Sin torch/numpy: la UI lo importa al arrancar sin cargar el motor TTS
+"""
+
+# Mapeo de modelos disponibles
+MODELS = {
+    "0.6B": "Qwen/Qwen3-TTS-12Hz-0.6B-CustomVoice",
+    "1.7B": "Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice",
+    "1.7B-VoiceDesign": "Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign",
+    "1.7B-Base": "Qwen/Qwen3-TTS-12Hz-1.7B-Base",
+}
+
+# Capacidades de cada modelo
+MODEL_CAPABILITIES = {
+    "0.6B": ["custom_voice"],
+    "1.7B": ["custom_voice"],
+    "1.7B-Base": ["voice_clone"],
+    "1.7B-VoiceDesign": ["voice_design"],
+}
+
+# Speakers disponibles en CustomVoice
+SPEAKERS = {
+    "Spanish": ["ryan", "aiden", "serena", "vivian"],
+    "Portuguese": ["ryan", "aiden", "serena", "vivian"],
+    "English": ["ryan", "aiden", "dylan", "eric"],
+    "Chinese": ["vivian", "serena", "uncle_fu"],
+    "Japanese": ["ono_anna"],
+    "Korean": ["sohee"],
+}
+
+ALL_SPEAKERS = ["aiden", "dylan", "eric", "ono_anna", "ryan", "serena", "sohee", "uncle_fu", "vivian"]
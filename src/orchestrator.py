@@ -2,17 +2,27 @@
 Orquestador para procesamiento de Audiolibros y Podcasts
 Maneja JSON de audiolibros y scripts de podcast
 """
+import gc
 import os
 import re
-import json
+import orjson
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Generator
 from dataclasses import dataclass
-import soundfile as sf
 import numpy as np
+import torch
 
 from .processor import AudioProcessor as AudioCleaner, ASREngine
-from .tts_engine import TTSEngine, VoiceLibrary, AudioProcessor
+from .tts_engine import (
+    TTSEngine, VoiceLibrary, AudioProcessor, WavAppender, SynthesisCache, MODEL_CAPABILITIES,
+    equal_power_fades
+)
+
+
+# Hilos para limpiar varias referencias a la vez (FFT/decodificacion sueltan el GIL)
+PROFILE_CLEAN_WORKERS = max(1, (os.cpu_count() or 2) // 2)
 
 
 @dataclass
@@ -28,6 +38,9 @@ class TextSegment:
 class AudiobookProcessor:
     """Procesa audiolibros desde JSON estructurado"""
 
+    # Segmentos mas largos se generan de uno en uno (chunking propio del TTSEngine)
+    BATCH_MAX_CHARS = 1500
+
     def __init__(
         self,
         tts_engine: TTSEngine,
@@ -46,7 +59,8 @@ class AudiobookProcessor:
         voice_name: Optional[str] = None,
         speaker: Optional[str] = None,
         language: str = "Spanish",
-        progress_callback=None
+        progress_callback=None,
+        batch_size: int = 4
     ) -> str:
         """
         Procesa un JSON de audiolibro
@@ -65,23 +79,51 @@ class AudiobookProcessor:
             json_path: Ruta al archivo JSON
             model_version: Versión del modelo TTS ("0.6B", "1.7B", etc.)
             voice_name: Nombre del perfil de voz a usar (opcional)
+            batch_size: Segmentos cortos consecutivos por llamada al modelo (1 = sin lotes)
 
         Returns:
             Ruta al audio generado
         """
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = orjson.loads(Path(json_path).read_bytes())
+
+        return self.process_data(
+            data, Path(json_path).stem, model_version, voice_name,
+            speaker, language, progress_callback, batch_size
+        )
+
+    def process_data(
+        self,
+        data: Dict,
+        default_title: str,
+        model_version: str = "1.7B",
+        voice_name: Optional[str] = None,
+        speaker: Optional[str] = None,
+        language: str = "Spanish",
+        progress_callback=None,
+        batch_size: int = 4
+    ) -> str:
+        """
+        Procesa un audiolibro ya parseado (mismo formato que process_json)
 
+        Args:
+            data: Contenido del JSON de audiolibro
+            default_title: Nombre base del archivo si no hay metadata.chapter_name
+            batch_size: Segmentos cortos consecutivos por llamada al modelo (1 = sin lotes)
+
+        Returns:
+            Ruta al audio generado
+        """
         # Determinar el título/nombre del archivo
         metadata = data.get("metadata", {})
         chapter_name = metadata.get("chapter_name", "")
         if chapter_name:
             book_title = Path(chapter_name).stem
         else:
-            book_title = Path(json_path).stem
+            book_title = default_title
 
         # Determinar el texto a sintetizar
         # Prioridad: tts_version > reading_version > content
+        segments: List[TextSegment] = []
         if "tts_version" in data and isinstance(data["tts_version"], str) and len(data["tts_version"]) > 100:
             # tts_version contiene el texto optimizado para TTS
             text_content = data["tts_version"]
@@ -107,7 +149,8 @@ class AudiobookProcessor:
         if text_content:
             segments = [TextSegment(text=text_content, speaker="narrator")]
 
-        audio_proc = AudioProcessor()
+        if not segments:
+            raise ValueError("El audiolibro no tiene segmentos para sintetizar")
 
         # Cargar modelo
         self.tts.load_model(model_version)
@@ -121,13 +164,136 @@ class AudiobookProcessor:
                 ref_audio = voice["audio_path"]
                 ref_text = voice["transcript"]
 
-        all_audio_segments = []
+        # Prompt de clonacion de la voz principal codificado una sola vez antes
+        # del bucle (las voces por segmento se codifican en su primer uso)
+        if ref_audio and ref_text and "voice_clone" in MODEL_CAPABILITIES.get(model_version, []):
+            self.tts.encode_reference(ref_audio, ref_text)
+
         total = len(segments)
+        output_path = self.output_dir / f"{book_title.replace(' ', '_')}.wav"
 
-        for i, segment in enumerate(segments):
-            if progress_callback:
-                progress_callback(i / total, f"Procesando segmento {i+1}/{total}")
+        # Cada segmento se normaliza y se vuelca al WAV apenas se genera:
+        # la memoria queda acotada al segmento mas largo, no al libro entero.
+        # La conversion a PCM y la escritura corren en un hilo aparte y se
+        # solapan con la inferencia del lote siguiente (torch suelta el GIL)
+        writer = None
+        pending = None
+        io_pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            for start, batch, seg_ref_audio, seg_ref_text in self._group_segments(
+                segments, ref_audio, ref_text, batch_size
+            ):
+                if progress_callback:
+                    progress_callback(start / total, f"Procesando segmento {start+1}/{total}")
+
+                if len(batch) > 1:
+                    # Segmentos cortos consecutivos con la misma voz/estilo: una sola llamada
+                    audios, sr = self.tts.generate_batch(
+                        [segment.text for segment in batch],
+                        ref_audio_path=seg_ref_audio,
+                        ref_text=seg_ref_text,
+                        instruct=batch[0].style,
+                        speaker=speaker,
+                        language=language,
+                        normalize_audio=True,
+                        add_narration_style=True
+                    )
+                else:
+                    # Generar audio con configuracion natural
+                    # El TTSEngine ahora maneja chunking, crossfade y normalizacion internamente
+                    audio, sr = self.tts.generate(
+                        text=batch[0].text,
+                        ref_audio_path=seg_ref_audio,
+                        ref_text=seg_ref_text,
+                        instruct=batch[0].style,
+                        speaker=speaker,
+                        language=language,
+                        use_natural_chunking=True,
+                        crossfade_ms=300,
+                        paragraph_pause_s=0.4,
+                        normalize_audio=True,
+                        add_narration_style=True
+                    )
+                    audios = [audio]
+
+                if writer is None:
+                    writer = WavAppender(str(output_path), sr)
+
+                # Un solo lote en vuelo: mantiene el orden y acota la memoria
+                first = pending is None
+                if pending is not None:
+                    pending.result()
+                pending = io_pool.submit(self._write_audios, writer, audios, first)
+
+            if pending is not None:
+                pending.result()
+        finally:
+            io_pool.shutdown(wait=True)
+            if writer is not None:
+                writer.close()
+
+        if progress_callback:
+            progress_callback(1.0, "Completado")
+
+        return str(output_path)
 
+    @classmethod
+    def _write_audios(cls, writer: WavAppender, audios: List[np.ndarray], first: bool):
+        """Vuelca los audios de un lote; el primero del libro va sin pausa previa"""
+        for audio in audios:
+            if first:
+                writer.append(audio)
+                first = False
+            else:
+                cls._append_with_transition(writer, audio)
+
+    @staticmethod
+    def _append_with_transition(
+        writer: WavAppender,
+        audio: np.ndarray,
+        pause_s: float = 0.5,
+        fade_ms: int = 300
+    ):
+        """
+        Agrega un segmento tras una pausa, con fade-in de potencia constante
+
+        Equivale a concatenar la pausa y hacer crossfade_smooth con el
+        segmento: el fade-out cae sobre silencio, asi que solo queda el fade-in.
+        """
+        sr = writer.sample_rate
+        pause_samples = int(pause_s * sr)
+        fade_samples = int(fade_ms * sr / 1000)
+
+        if len(audio) < fade_samples or pause_samples < fade_samples:
+            writer.append(AudioProcessor.add_silence(pause_s, sr))
+            writer.append(audio)
+            return
+
+        writer.append(AudioProcessor.add_silence(pause_s, sr)[fade_samples:])
+        writer.append(audio[:fade_samples] * equal_power_fades(fade_samples)[1])
+        writer.append(audio[fade_samples:])
+
+    def _group_segments(
+        self,
+        segments: List[TextSegment],
+        ref_audio: Optional[str],
+        ref_text: Optional[str],
+        batch_size: int
+    ) -> Generator[Tuple[int, List[TextSegment], Optional[str], Optional[str]], None, None]:
+        """
+        Agrupa segmentos consecutivos que comparten voz y estilo en lotes
+
+        Solo se agrupan textos que el TTSEngine generaria sin chunking
+        (<= BATCH_MAX_CHARS); los largos salen como lote de uno.
+
+        Yields:
+            (indice del primer segmento, lote, ref_audio, ref_text)
+        """
+        batch: List[TextSegment] = []
+        batch_start = 0
+        batch_key = None
+
+        for i, segment in enumerate(segments):
             # Si el segmento tiene su propia voz, usarla
             seg_ref_audio = ref_audio
             seg_ref_text = ref_text
@@ -138,50 +304,24 @@ class AudiobookProcessor:
                     seg_ref_audio = voice["audio_path"]
                     seg_ref_text = voice["transcript"]
 
-            # Generar audio con configuracion natural
-            # El TTSEngine ahora maneja chunking, crossfade y normalizacion internamente
-            audio, sr = self.tts.generate(
-                text=segment.text,
-                ref_audio_path=seg_ref_audio,
-                ref_text=seg_ref_text,
-                instruct=segment.style,
-                speaker=speaker,
-                language=language,
-                use_natural_chunking=True,
-                crossfade_ms=300,
-                paragraph_pause_s=0.4,
-                normalize_audio=False,  # Normalizaremos al final
-                add_narration_style=True
-            )
-
-            all_audio_segments.append(audio)
-
-        # Combinar segmentos con crossfade suave
-        if len(all_audio_segments) == 1:
-            final_audio = all_audio_segments[0]
-        else:
-            final_audio = all_audio_segments[0]
-            for i in range(1, len(all_audio_segments)):
-                # Pausa entre segmentos principales (capitulos/secciones)
-                pause = audio_proc.add_silence(0.5, self.tts.sample_rate)
-                final_audio = np.concatenate([final_audio, pause])
-                # Crossfade con el siguiente segmento
-                final_audio = audio_proc.crossfade_smooth(
-                    final_audio, all_audio_segments[i],
-                    300, self.tts.sample_rate
-                )
+            key = (seg_ref_audio, seg_ref_text, segment.style)
+            batchable = batch_size > 1 and len(segment.text) <= self.BATCH_MAX_CHARS
 
-        # Normalizacion dinamica final
-        final_audio = audio_proc.dynamic_normalize(final_audio, self.tts.sample_rate)
+            if batch and (not batchable or key != batch_key or len(batch) >= batch_size):
+                yield batch_start, batch, batch_key[0], batch_key[1]
+                batch = []
 
-        # Guardar
-        output_path = self.output_dir / f"{book_title.replace(' ', '_')}.wav"
-        sf.write(str(output_path), final_audio, self.tts.sample_rate, format='WAV', subtype='PCM_16')
+            if not batchable:
+                yield i, [segment], seg_ref_audio, seg_ref_text
+                continue
 
-        if progress_callback:
-            progress_callback(1.0, "Completado")
+            if not batch:
+                batch_start = i
+                batch_key = key
+            batch.append(segment)
 
-        return str(output_path)
+        if batch:
+            yield batch_start, batch, batch_key[0], batch_key[1]
 
 
 class PodcastProcessor:
@@ -190,59 +330,72 @@ class PodcastProcessor:
     # Regex para detectar [HH:MM] Speaker: Message
     PATTERN = r"\[(\d{1,2}:\d{2})\]\s*(\w+):\s*(.+)"
 
+    # Mismo patron aplicado al script completo: una cabecera por linea (sin
+    # cruzar saltos de linea) y el texto sin espacios iniciales
+    LINE_RE = re.compile(
+        r"^[^\S\n]*\[(\d{1,2}:\d{2})\][^\S\n]*(\w+):[^\S\n]*(\S.*)$", re.MULTILINE
+    )
+
+    # Estilo por puntuacion/palabras clave, en orden de prioridad
+    # (IGNORECASE en lugar de text.lower(): no copia el texto por segmento)
+    STYLE_RULES = (
+        (re.compile(r"\?"), "con tono inquisitivo"),
+        (re.compile(r"!"), "con entusiasmo"),
+        (re.compile(r"jaja|jeje", re.IGNORECASE), "con tono divertido"),
+    )
+    DEFAULT_STYLE = "con tono conversacional"
+
+    # Mismo limite que AudiobookProcessor: los turnos mas largos van de uno en uno
+    BATCH_MAX_CHARS = AudiobookProcessor.BATCH_MAX_CHARS
+
     def __init__(
         self,
         tts_engine: TTSEngine,
         voice_library: VoiceLibrary,
-        output_dir: str
+        output_dir: str,
+        cache_dir: str
     ):
         self.tts = tts_engine
         self.voices = voice_library
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.speaker_map: Dict[str, str] = {}  # speaker -> voice_name
+        # Fuera de output/: esa carpeta se sirve como estaticos publicos
+        self.cache = SynthesisCache(cache_dir)
+        self.audio_proc = AudioProcessor()
 
     def parse_script(self, script_text: str) -> List[TextSegment]:
         """Parsea script de podcast"""
         segments = []
+        matches = list(self.LINE_RE.finditer(script_text))
 
-        for line in script_text.strip().split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-
-            match = re.match(self.PATTERN, line)
-            if match:
-                timestamp, speaker, text = match.groups()
+        for k, match in enumerate(matches):
+            timestamp, speaker, text = match.groups()
+            text = text.rstrip()
 
-                # Detectar estilo por puntuación
-                style = self._detect_style(text)
+            # Lineas sin formato timestamp hasta la siguiente cabecera: continuacion
+            next_start = matches[k + 1].start() if k + 1 < len(matches) else len(script_text)
+            continuation = [
+                line.strip() for line in script_text[match.end():next_start].split('\n')
+            ]
+            full_text = " ".join([text, *filter(None, continuation)])
 
-                segments.append(TextSegment(
-                    text=text,
-                    speaker=speaker,
-                    timestamp=timestamp,
-                    style=style
-                ))
-            else:
-                # Línea sin formato timestamp, agregar como continuación
-                if segments:
-                    segments[-1].text += " " + line
+            segments.append(TextSegment(
+                text=full_text,
+                speaker=speaker,
+                timestamp=timestamp,
+                # Detectar estilo por puntuación (solo la linea de cabecera)
+                style=self._detect_style(text)
+            ))
 
         return segments
 
     def _detect_style(self, text: str) -> str:
         """Detecta estilo basado en puntuación y palabras clave"""
-        text_lower = text.lower()
-
-        if "?" in text:
-            return "con tono inquisitivo"
-        elif "!" in text:
-            return "con entusiasmo"
-        elif "jaja" in text_lower or "jeje" in text_lower:
-            return "con tono divertido"
-        else:
-            return "con tono conversacional"
+        for pattern, style in self.STYLE_RULES:
+            if pattern.search(text):
+                return style
+        return self.DEFAULT_STYLE
 
     def assign_voice(self, speaker: str, voice_name: str):
         """Asigna una voz de la librería a un speaker"""
@@ -260,7 +413,8 @@ class PodcastProcessor:
         language: str = "Spanish",
         progress_callback=None,
         crossfade_ms: int = 250,
-        turn_pause_s: float = 0.35
+        turn_pause_s: float = 0.35,
+        batch_size: int = 4
     ) -> str:
         """
         Procesa script de podcast con audio natural
@@ -272,17 +426,42 @@ class PodcastProcessor:
             progress_callback: Callback de progreso
             crossfade_ms: Crossfade entre segmentos (ms)
             turn_pause_s: Pausa entre turnos de habla (segundos)
+            batch_size: Turnos cortos con la misma voz y estilo por llamada al modelo
 
         Returns:
             Ruta al audio generado
         """
-        from .tts_engine import ALL_SPEAKERS
-
-        audio_proc = AudioProcessor()
-
         with open(script_path, 'r', encoding='utf-8') as f:
             script_text = f.read()
 
+        return self.process_text(
+            script_text, Path(script_path).stem, tts_version, language,
+            progress_callback, crossfade_ms, turn_pause_s, batch_size
+        )
+
+    def process_text(
+        self,
+        script_text: str,
+        script_name: str,
+        tts_version: str = "1.7B",
+        language: str = "Spanish",
+        progress_callback=None,
+        crossfade_ms: int = 250,
+        turn_pause_s: float = 0.35,
+        batch_size: int = 4
+    ) -> str:
+        """
+        Procesa un script de podcast ya cargado en memoria
+
+        Args:
+            script_text: Contenido del script
+            script_name: Nombre base del archivo de salida
+
+        Returns:
+            Ruta al audio generado
+        """
+        from .tts_engine import ALL_SPEAKERS
+
         segments = self.parse_script(script_text)
 
         # Verificar voces asignadas
@@ -293,81 +472,112 @@ class PodcastProcessor:
         # Cargar modelo
         self.tts.load_model(tts_version)
 
-        all_audio_segments = []
         total = len(segments)
-        prev_speaker = None
-
-        for i, segment in enumerate(segments):
-            if progress_callback:
-                progress_callback(i / total, f"[{segment.speaker}] {i+1}/{total}")
-
-            # Obtener voz asignada
-            voice_name = self.speaker_map.get(segment.speaker)
-
-            # Determinar si es voz clonada o speaker Qwen
-            ref_audio = None
-            ref_text = None
-            qwen_speaker = None
 
+        # Voz de cada speaker resuelta una vez: (ref_audio, ref_text, qwen_speaker)
+        qwen_speakers = {s.lower() for s in ALL_SPEAKERS}
+        resolved = {}
+        for speaker in {segment.speaker for segment in segments}:
+            voice_name = self.speaker_map.get(speaker)
+            ref_audio = ref_text = qwen_speaker = None
             if voice_name:
-                if voice_name.lower() in [s.lower() for s in ALL_SPEAKERS]:
+                if voice_name.lower() in qwen_speakers:
                     qwen_speaker = voice_name.lower()
                 else:
                     voice = self.voices.get_voice(voice_name)
                     if voice:
                         ref_audio = voice["audio_path"]
                         ref_text = voice["transcript"]
+            resolved[speaker] = (ref_audio, ref_text, qwen_speaker)
 
-            # Generar con configuracion natural
-            audio, sr = self.tts.generate(
-                text=segment.text,
-                ref_audio_path=ref_audio,
-                ref_text=ref_text,
-                speaker=qwen_speaker,
-                instruct=segment.style,
-                language=language,
-                use_natural_chunking=True,
-                crossfade_ms=200,  # Crossfade interno mas corto
-                normalize_audio=False,  # Normalizaremos al final
-                add_narration_style=True
+        # Turnos ya sintetizados (cache) y turnos repetidos dentro del script:
+        # solo se genera el primero de cada clave y el resto reutiliza su audio
+        audios: List[Optional[np.ndarray]] = [None] * total
+        cache_keys = []
+        pending: Dict[str, List[int]] = {}
+        for i, segment in enumerate(segments):
+            ref_audio, ref_text, qwen_speaker = resolved[segment.speaker]
+            ref_mtime = Path(ref_audio).stat().st_mtime_ns if ref_audio else None
+            cache_key = self.cache.make_key(
+                segment.text, ref_audio, ref_mtime, ref_text, qwen_speaker,
+                segment.style, language, tts_version
+            )
+            cache_keys.append(cache_key)
+            if cache_key in pending:
+                pending[cache_key].append(i)
+                continue
+            audios[i] = self.cache.get(cache_key)
+            if audios[i] is None:
+                pending[cache_key] = [i]
+
+        # Turnos cortos agrupados por (voz, estilo) en todo el script; cada lote es
+        # una sola llamada al modelo y los audios vuelven a su posicion original
+        groups = defaultdict(list)
+        batches = []
+        for indices in pending.values():
+            i = indices[0]
+            segment = segments[i]
+            key = (*resolved[segment.speaker], segment.style)
+            if batch_size > 1 and len(segment.text) <= self.BATCH_MAX_CHARS:
+                groups[key].append(i)
+            else:
+                batches.append((key, [i]))
+        for key, indices in groups.items():
+            batches.extend(
+                (key, indices[k:k + batch_size]) for k in range(0, len(indices), batch_size)
             )
 
-            # Detectar cambio de speaker para pausas
-            is_speaker_change = prev_speaker is not None and prev_speaker != segment.speaker
-            prev_speaker = segment.speaker
-
-            all_audio_segments.append({
-                'audio': audio,
-                'is_speaker_change': is_speaker_change
-            })
-
-        # Combinar segmentos con crossfade y pausas naturales
-        if len(all_audio_segments) == 1:
-            final_audio = all_audio_segments[0]['audio']
-        else:
-            final_audio = all_audio_segments[0]['audio']
-
-            for i in range(1, len(all_audio_segments)):
-                curr = all_audio_segments[i]
-
-                # Pausa antes del segmento si hay cambio de speaker
-                if curr['is_speaker_change']:
-                    pause = audio_proc.add_silence(turn_pause_s, self.tts.sample_rate)
-                    final_audio = np.concatenate([final_audio, pause])
-
-                # Aplicar crossfade
-                final_audio = audio_proc.crossfade_smooth(
-                    final_audio, curr['audio'],
-                    crossfade_ms, self.tts.sample_rate
+        done = total - sum(len(indices) for indices in pending.values())
+        for (ref_audio, ref_text, qwen_speaker, style), indices in batches:
+            if progress_callback:
+                progress_callback(done / total, f"[{segments[indices[0]].speaker}] {done+1}/{total}")
+            done += sum(len(pending[cache_keys[i]]) for i in indices)
+
+            if len(indices) > 1:
+                batch_audios, sr = self.tts.generate_batch(
+                    [segments[i].text for i in indices],
+                    ref_audio_path=ref_audio,
+                    ref_text=ref_text,
+                    speaker=qwen_speaker,
+                    instruct=style,
+                    language=language,
+                    normalize_audio=False,  # Normalizaremos al final
+                    add_narration_style=True
                 )
+            else:
+                # Generar con configuracion natural
+                audio, sr = self.tts.generate(
+                    text=segments[indices[0]].text,
+                    ref_audio_path=ref_audio,
+                    ref_text=ref_text,
+                    speaker=qwen_speaker,
+                    instruct=style,
+                    language=language,
+                    use_natural_chunking=True,
+                    crossfade_ms=200,  # Crossfade interno mas corto
+                    normalize_audio=False,  # Normalizaremos al final
+                    add_narration_style=True
+                )
+                batch_audios = [audio]
+
+            for i, audio in zip(indices, batch_audios):
+                self.cache.put(cache_keys[i], audio)
+                for j in pending[cache_keys[i]]:
+                    audios[j] = audio
+
+        # Pausa natural antes de cada cambio de speaker; crossfade entre turnos
+        pause_before = [
+            i > 0 and segments[i - 1].speaker != segment.speaker
+            for i, segment in enumerate(segments)
+        ]
+        final_audio = self.audio_proc.crossfade_chain(
+            audios, pause_before, crossfade_ms, turn_pause_s, self.tts.sample_rate
+        )
 
-        # Normalizar volumen final
-        final_audio = audio_proc.dynamic_normalize(final_audio, self.tts.sample_rate)
-
-        # Guardar
-        script_name = Path(script_path).stem
+        # Normalizar volumen final y guardar por bloques
         output_path = self.output_dir / f"{script_name}_podcast.wav"
-        sf.write(str(output_path), final_audio, self.tts.sample_rate, format='WAV', subtype='PCM_16')
+        with WavAppender(str(output_path), self.tts.sample_rate) as writer:
+            self.audio_proc.write_dynamic_normalized(writer, final_audio)
 
         if progress_callback:
             progress_callback(1.0, "Completado")
@@ -388,6 +598,7 @@ class VoiceStudio:
         self.asr = ASREngine()
         self.tts = TTSEngine()
         self.voice_library = VoiceLibrary(str(self.base_path / "voice_library"))
+        self.tts.prompt_cache_dir = self.voice_library.library_path / ".prompts"
 
         # Procesadores
         self.audiobook = AudiobookProcessor(
@@ -398,39 +609,48 @@ class VoiceStudio:
         self.podcast = PodcastProcessor(
             self.tts,
             self.voice_library,
-            str(self.base_path / "output")
+            str(self.base_path / "output"),
+            str(self.base_path / ".cache" / "synthesis")
         )
 
+    def unload_models(self):
+        """
+        Descarga TTS y ASR y devuelve la VRAM al driver
+
+        gc.collect() antes de empty_cache(): el allocator no libera bloques
+        de tensores que sigan referenciados desde ciclos aun no recolectados.
+        """
+        self.tts.unload_model()
+        self.asr.unload_model()
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            torch.cuda.ipc_collect()
+
     def create_voice_profile(
         self,
         name: str,
         audio_path: str,
         language: str = "Spanish",
         auto_transcribe: bool = True,
-        style_tags: List[str] = None
+        style_tags: List[str] = None,
+        transcript: str = ""
     ) -> Dict:
         """
         Crea perfil de voz desde audio de referencia
 
         Pipeline completo:
         1. Limpiar audio
-        2. Transcribir con ASR
+        2. Transcribir con ASR (se omite si ya viene transcript)
         3. Guardar en librería
         """
-        # Limpiar audio
-        clean_path = self.audio_cleaner.clean_audio(audio_path)
+        clean_path = self._prepare_reference(audio_path)
 
-        # Recortar si es muy largo
-        duration = self.audio_cleaner.get_audio_duration(clean_path)
-        if duration > 30:
-            clean_path = self.audio_cleaner.trim_audio(clean_path, 30)
-
-        # Transcribir
-        transcript = ""
-        if auto_transcribe:
-            self.asr.load_model()
-            transcript = self.asr.transcribe(clean_path, language.lower())
-            self.asr.unload_model()  # Liberar VRAM
+        # Transcribir (la sesion libera la VRAM al terminar, salvo que haya
+        # una asr_session() abierta por fuera)
+        if auto_transcribe and not transcript:
+            with self.asr.session():
+                transcript = self.asr.transcribe(clean_path, language.lower())
 
         # Guardar en librería
         profile = self.voice_library.add_voice(
@@ -443,6 +663,60 @@ class VoiceStudio:
 
         return profile
 
+    def create_voice_profiles(
+        self,
+        items: List[Tuple[str, str]],
+        language: str = "Spanish",
+        style_tags: List[str] = None
+    ) -> List[Dict]:
+        """
+        Crea varios perfiles de voz con una sola carga del ASR
+
+        Args:
+            items: Pares (nombre, ruta de audio)
+
+        Returns:
+            Perfiles creados, en el orden de items
+        """
+        if not items:
+            return []
+
+        # La limpieza corre en paralelo mientras el ASR se carga en este hilo
+        workers = min(len(items), PROFILE_CLEAN_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._prepare_reference, audio_path) for _, audio_path in items]
+            with self.asr.session():
+                clean_paths = [future.result() for future in futures]
+                transcripts = self.asr.transcribe_batch(clean_paths, language.lower())
+
+        return [
+            self.voice_library.add_voice(
+                name=name,
+                audio_path=clean_path,
+                transcript=transcript,
+                language=language,
+                style_tags=style_tags
+            )
+            for (name, _), clean_path, transcript in zip(items, clean_paths, transcripts)
+        ]
+
+    def asr_session(self):
+        """Mantiene el ASR cargado entre varias llamadas a create_voice_profile"""
+        return self.asr.session()
+
+    def _prepare_reference(self, audio_path: str) -> str:
+        """Limpia el audio de referencia y lo recorta si es muy largo"""
+        # Todo en memoria: una sola decodificacion y una sola escritura del WAV
+        cleaner = self.audio_cleaner
+        y = cleaner.clean(cleaner.load(audio_path))
+
+        # Recortar si es muy largo
+        y = cleaner.trim(y, 30)
+
+        clean_path = cleaner.derived_path(audio_path, "clean")
+        cleaner.write_wav(clean_path, y)
+        return clean_path
+
     def generate_speech(
         self,
         text: str,
@@ -472,11 +746,30 @@ class VoiceStudio:
         voice_name: Optional[str] = None,
         speaker: Optional[str] = None,
         language: str = "Spanish",
-        progress_callback=None
+        progress_callback=None,
+        batch_size: int = 4
     ) -> str:
         """Procesa audiolibro desde JSON"""
         return self.audiobook.process_json(
-            json_path, model_version, voice_name, speaker, language, progress_callback
+            json_path, model_version, voice_name, speaker, language, progress_callback,
+            batch_size
+        )
+
+    def process_audiobook_content(
+        self,
+        content: str,
+        title: str,
+        model_version: str = "1.7B",
+        voice_name: Optional[str] = None,
+        speaker: Optional[str] = None,
+        language: str = "Spanish",
+        progress_callback=None,
+        batch_size: int = 4
+    ) -> str:
+        """Procesa audiolibro desde un string JSON, sin pasar por disco"""
+        return self.audiobook.process_data(
+            orjson.loads(content), title, model_version, voice_name, speaker,
+            language, progress_callback, batch_size
         )
 
     def process_podcast_script(
@@ -485,7 +778,8 @@ class VoiceStudio:
         speaker_voices: Dict[str, str],
         model_version: str = "1.7B",
         language: str = "Spanish",
-        progress_callback=None
+        progress_callback=None,
+        batch_size: int = 4
     ) -> str:
         """
         Procesa podcast con mapeo de voces
@@ -495,9 +789,31 @@ class VoiceStudio:
             speaker_voices: Diccionario {speaker_name: voice_profile_name}
             model_version: Versión del modelo TTS
             language: Idioma para la sintesis
+            batch_size: Turnos cortos por llamada al modelo
         """
         # Asignar voces
         for speaker, voice in speaker_voices.items():
             self.podcast.assign_voice(speaker, voice)
 
-        return self.podcast.process_script(script_path, model_version, language, progress_callback)
+        return self.podcast.process_script(
+            script_path, model_version, language, progress_callback, batch_size=batch_size
+        )
+
+    def process_podcast_content(
+        self,
+        script_text: str,
+        name: str,
+        speaker_voices: Dict[str, str],
+        model_version: str = "1.7B",
+        language: str = "Spanish",
+        progress_callback=None,
+        batch_size: int = 4
+    ) -> str:
+        """Procesa podcast desde el texto del script, sin pasar por disco"""
+        for speaker, voice in speaker_voices.items():
+            self.podcast.assign_voice(speaker, voice)
+
+        return self.podcast.process_text(
+            script_text, name, model_version, language, progress_callback,
+            batch_size=batch_size
+        )
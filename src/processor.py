@@ -2,15 +2,28 @@
 Módulo de procesamiento de audio y ASR usando Qwen3-ASR
 Limpieza de audio, detección de voz y transcripción automática
 """
-import os
+import threading
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
 import torch
 import numpy as np
 import librosa
 import soundfile as sf
-import noisereduce as nr
 from pathlib import Path
 
 
+# Spectral gating: parametros STFT y tramo inicial usado como perfil de ruido
+NOISE_N_FFT = 1024
+NOISE_HOP = 256
+NOISE_PROFILE_S = 0.5
+NOISE_PROP_DECREASE = 0.8
+# El tramo inicial solo vale como ruido si su energia por frame queda por
+# debajo de esta fraccion de la mediana del clip (-10 dB); si no, el perfil
+# sale de un percentil bajo de cada banda sobre todo el clip
+NOISE_HEAD_MAX_ENERGY_RATIO = 0.1
+NOISE_FLOOR_PERCENTILE = 10
+
+
 class AudioProcessor:
     """Procesa y limpia audio de referencia para clonación de voz"""
 
@@ -28,46 +41,153 @@ class AudioProcessor:
         Returns:
             Ruta al audio limpio
         """
-        y, sr = librosa.load(input_path, sr=self.sample_rate)
+        y_final = self.clean(self.load(input_path))
+
+        if output_path is None:
+            output_path = self.derived_path(input_path, "clean")
+
+        self.write_wav(output_path, y_final)
+        return output_path
+
+    def load(self, input_path: str) -> np.ndarray:
+        """
+        Decodifica el audio a mono float32 en la tasa de muestreo del procesador
+
+        Lee directo con soundfile y remuestrea con soxr solo si la tasa
+        difiere; lo que libsndfile no abre (m4a, etc.) pasa por librosa.
+        """
+        try:
+            y, orig_sr = sf.read(input_path, dtype='float32', always_2d=False)
+        except RuntimeError:
+            y, _ = librosa.load(input_path, sr=self.sample_rate, dtype=np.float32)
+            return y
+
+        if y.ndim > 1:
+            y = y.mean(axis=1, dtype=np.float32)
+
+        if orig_sr != self.sample_rate:
+            import soxr  # Dependencia de librosa (su remuestreador por defecto)
+            y = soxr.resample(y, orig_sr, self.sample_rate, quality='HQ')
+
+        return y
 
+    def clean(self, y: np.ndarray) -> np.ndarray:
+        """Reduccion de ruido, VAD y normalizacion sobre audio ya cargado"""
         # Reducción de ruido estacionario
-        y_clean = nr.reduce_noise(y=y, sr=sr, prop_decrease=0.8)
+        y_clean = self.reduce_noise(y, NOISE_PROP_DECREASE)
 
-        # Voice Activity Detection - extraer partes con voz
+        # Voice Activity Detection - extraer partes con voz; el pico para la
+        # normalización se mide mientras se copia cada intervalo
         intervals = librosa.effects.split(y_clean, top_db=25)
 
         if len(intervals) > 0:
-            y_clean = np.concatenate([y_clean[start:end] for start, end in intervals])
+            y_clean, peak = self._join_intervals(y_clean, intervals)
+        else:
+            peak = max(y_clean.max(initial=0.0), -y_clean.min(initial=0.0))
+
+        # Normalización por pico, en sitio (como librosa.util.normalize: las
+        # señales casi nulas quedan tal cual)
+        y_clean = y_clean.astype(np.float32, copy=False)
+        if peak >= np.finfo(np.float32).tiny:
+            y_clean /= peak
+        return y_clean
+
+    def trim(self, y: np.ndarray, max_duration: float = 30.0) -> np.ndarray:
+        """Recorta audio ya cargado a duración máxima (vista, sin copia)"""
+        return y[:int(max_duration * self.sample_rate)]
+
+    def write_wav(self, path: str, y: np.ndarray):
+        """Escribe audio del procesador como WAV PCM 16-bit"""
+        sf.write(path, y, self.sample_rate, format='WAV', subtype='PCM_16')
+
+    @staticmethod
+    def derived_path(input_path: str, suffix: str) -> str:
+        """Ruta .wav junto al original: <stem>_<suffix>.wav"""
+        base = Path(input_path)
+        # Siempre guardar como .wav (soundfile no soporta opus/ogg)
+        return str(base.parent / f"{base.stem}_{suffix}.wav")
 
-        # Normalización
-        y_final = librosa.util.normalize(y_clean)
+    def _noise_profile(self, mag: np.ndarray) -> np.ndarray:
+        """
+        Magnitud del ruido por banda
 
-        if output_path is None:
-            base = Path(input_path)
-            # Siempre guardar como .wav (soundfile no soporta opus/ogg)
-            output_path = str(base.parent / f"{base.stem}_clean.wav")
+        Usa la media del tramo inicial solo si es claramente silencio; las
+        referencias suelen empezar hablando, y restar el espectro de la voz
+        la deja hueca y con ruido musical. En ese caso el piso de ruido sale
+        de un percentil bajo de cada banda sobre todos los frames.
+        """
+        energy = np.einsum('ft,ft->t', mag, mag)
+        head_frames = -(-int(NOISE_PROFILE_S * self.sample_rate) // NOISE_HOP)
+        head = mag[:, :head_frames]
+        if energy[:head_frames].mean() < NOISE_HEAD_MAX_ENERGY_RATIO * np.median(energy):
+            return head.mean(axis=1, keepdims=True)
+        return np.percentile(mag, NOISE_FLOOR_PERCENTILE, axis=1, keepdims=True)
+
+    def reduce_noise(self, y: np.ndarray, prop_decrease: float = NOISE_PROP_DECREASE) -> np.ndarray:
+        """
+        Spectral gating estacionario con un unico perfil de ruido
 
-        sf.write(output_path, y_final, self.sample_rate, format='WAV', subtype='PCM_16')
-        return output_path
+        Args:
+            y: Audio mono
+            prop_decrease: Proporcion del ruido a restar (0-1)
 
-    def get_audio_duration(self, audio_path: str) -> float:
-        """Retorna duración del audio en segundos"""
-        y, sr = librosa.load(audio_path, sr=None)
-        return len(y) / sr
+        Returns:
+            Audio con el ruido atenuado
+        """
+        spec = librosa.stft(y, n_fft=NOISE_N_FFT, hop_length=NOISE_HOP)
+        mag = np.abs(spec)
+        noise_mag = self._noise_profile(mag)
 
-    def trim_audio(self, input_path: str, max_duration: float = 30.0) -> str:
+        # Mascara de sustraccion espectral, calculada en sitio sobre mag
+        gated = np.maximum(mag - prop_decrease * noise_mag, 0)
+        np.divide(gated, mag, out=mag, where=mag > 0)
+        spec *= mag
+
+        return librosa.istft(spec, hop_length=NOISE_HOP, length=len(y))
+
+    @staticmethod
+    def _join_intervals(y: np.ndarray, intervals: np.ndarray) -> Tuple[np.ndarray, float]:
         """
-        Recorta audio a duración máxima (ideal 5-30s para clonación)
+        Copia los intervalos con voz a un buffer reservado una sola vez
+
+        Returns:
+            (audio con voz, pico absoluto), el pico medido sobre cada tramo
+            recien copiado mientras sigue en cache
         """
-        y, sr = librosa.load(input_path, sr=self.sample_rate)
-        max_samples = int(max_duration * sr)
+        lengths = intervals[:, 1] - intervals[:, 0]
+        out = np.empty(int(lengths.sum()), dtype=y.dtype)
+        pos = 0
+        peak = 0.0
+        for (start, end), length in zip(intervals, lengths):
+            chunk = out[pos:pos + length]
+            chunk[:] = y[start:end]
+            peak = max(peak, chunk.max(initial=0.0), -chunk.min(initial=0.0))
+            pos += length
+        return out, float(peak)
+
+    def get_audio_duration(self, audio, sample_rate: Optional[int] = None) -> float:
+        """
+        Retorna duración del audio en segundos
 
-        if len(y) > max_samples:
-            y = y[:max_samples]
+        Args:
+            audio: Ruta al archivo (se lee solo la cabecera) o array ya cargado
+            sample_rate: Tasa del array (por defecto la del procesador)
+        """
+        if isinstance(audio, np.ndarray):
+            return len(audio) / (sample_rate or self.sample_rate)
 
-        base = Path(input_path)
-        output_path = str(base.parent / f"{base.stem}_trimmed.wav")
-        sf.write(output_path, y, sr, format='WAV', subtype='PCM_16')
+        try:
+            return sf.info(audio).duration
+        except RuntimeError:
+            # Formatos que libsndfile no abre (m4a, etc.): librosa via audioread
+            return librosa.get_duration(path=audio)
+
+    def trim_audio(self, input_path: str, max_duration: float = 30.0) -> str:
+        """
+        Recorta audio a duración máxima (ideal 5-30s para clonación)
+        """
+        output_path = self.derived_path(input_path, "trimmed")
+        self.write_wav(output_path, self.trim(self.load(input_path), max_duration))
         return output_path
 
 
@@ -88,24 +208,55 @@ class ASREngine:
         self.device = device
         self.model_path = model_path
         self.model = None
+        # Sesiones abiertas: mientras haya alguna, el modelo no se descarga.
+        # El lock (reentrante) cubre contador, carga y descarga: dos hilos no
+        # cargan el modelo dos veces ni lo descargan bajo otra sesion
+        self._sessions = 0
+        self._lock = threading.RLock()
 
     def load_model(self):
         """Carga el modelo ASR en memoria"""
-        if self.model is not None:
-            return
+        with self._lock:
+            if self.model is not None:
+                return
+
+            print(f"Cargando ASR: {self.model_path}...")
 
-        print(f"Cargando ASR: {self.model_path}...")
+            from qwen_asr import Qwen3ASRModel
 
-        from qwen_asr import Qwen3ASRModel
+            self.model = Qwen3ASRModel.from_pretrained(
+                self.model_path,
+                dtype=torch.bfloat16,
+                device_map=f"{self.device}:0" if self.device == "cuda" else self.device,
+                max_new_tokens=512,
+            )
 
-        self.model = Qwen3ASRModel.from_pretrained(
-            self.model_path,
-            dtype=torch.bfloat16,
-            device_map=f"{self.device}:0" if self.device == "cuda" else self.device,
-            max_new_tokens=512,
-        )
+            print("ASR cargado")
 
-        print("ASR cargado")
+    @contextmanager
+    def session(self):
+        """
+        Mantiene el modelo cargado durante el bloque
+
+        Las sesiones anidadas reutilizan el mismo modelo; se descarga al
+        cerrar la ultima, no despues de cada transcripcion.
+        """
+        with self._lock:
+            self._sessions += 1
+            try:
+                self.load_model()
+            except BaseException:
+                self._sessions -= 1
+                raise
+        try:
+            yield self
+        finally:
+            # Decision y descarga bajo el mismo lock: ninguna sesion nueva
+            # puede empezar entre "era la ultima" y unload_model()
+            with self._lock:
+                self._sessions -= 1
+                if self._sessions == 0:
+                    self.unload_model()
 
     def transcribe(self, audio_path: str, language: str = "spanish") -> str:
         """
@@ -123,19 +274,46 @@ class ASREngine:
         # Mapear idioma al formato esperado
         lang = self.LANGUAGE_MAP.get(language, None)
 
-        results = self.model.transcribe(
-            audio=audio_path,
-            language=lang,  # None para detección automática
-        )
+        # Solo la inferencia bajo inference_mode (load_model queda fuera: los
+        # pesos no deben crearse como inference tensors). Sin autocast: el
+        # modelo ya se carga en bfloat16
+        with torch.inference_mode():
+            results = self.model.transcribe(
+                audio=audio_path,
+                language=lang,  # None para detección automática
+            )
 
         if results and len(results) > 0:
             return results[0].text.strip()
         return ""
 
+    def transcribe_batch(self, audio_paths: List[str], language: str = "spanish") -> List[str]:
+        """
+        Transcribe varios audios en una sola llamada al modelo
+
+        Returns:
+            Textos transcritos, en el orden de audio_paths
+        """
+        if not audio_paths:
+            return []
+
+        self.load_model()
+
+        lang: Optional[str] = self.LANGUAGE_MAP.get(language, None)
+
+        with torch.inference_mode():
+            results = self.model.transcribe(
+                audio=list(audio_paths),
+                language=[lang] * len(audio_paths),
+            )
+
+        return [result.text.strip() for result in results]
+
     def unload_model(self):
         """Libera memoria del modelo ASR"""
-        if self.model is not None:
-            del self.model
-            self.model = None
-            torch.cuda.empty_cache()
-            print("ASR descargado de memoria")
+        with self._lock:
+            if self.model is not None:
+                del self.model
+                self.model = None
+                torch.cuda.empty_cache()
+                print("ASR descargado de memoria")
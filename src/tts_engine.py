@@ -3,47 +3,70 @@ Motor TTS usando modelos Qwen3-TTS
 Optimizado para narracion natural sin cortes bruscos
 Soporta: CustomVoice, VoiceDesign, y clonacion de voz
 """
-import os
 import re
+import struct
+import hashlib
 import torch
 import soundfile as sf
 import numpy as np
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, Hashable
 from collections import OrderedDict
+from functools import lru_cache
 
+# Catalogo sin dependencias pesadas; re-exportado aqui por compatibilidad
+from .model_catalog import MODELS, MODEL_CAPABILITIES, SPEAKERS, ALL_SPEAKERS
 
-# Mapeo de modelos disponibles
-MODELS = {
-    "0.6B": "Qwen/Qwen3-TTS-12Hz-0.6B-CustomVoice",
-    "1.7B": "Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice",
-    "1.7B-VoiceDesign": "Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign",
-    "1.7B-Base": "Qwen/Qwen3-TTS-12Hz-1.7B-Base",
-}
-
-# Capacidades de cada modelo
-MODEL_CAPABILITIES = {
-    "0.6B": ["custom_voice"],
-    "1.7B": ["custom_voice"],
-    "1.7B-Base": ["voice_clone"],
-    "1.7B-VoiceDesign": ["voice_design"],
-}
-
-# Speakers disponibles en CustomVoice
-SPEAKERS = {
-    "Spanish": ["ryan", "aiden", "serena", "vivian"],
-    "Portuguese": ["ryan", "aiden", "serena", "vivian"],
-    "English": ["ryan", "aiden", "dylan", "eric"],
-    "Chinese": ["vivian", "serena", "uncle_fu"],
-    "Japanese": ["ono_anna"],
-    "Korean": ["sohee"],
-}
-
-ALL_SPEAKERS = ["aiden", "dylan", "eric", "ono_anna", "ryan", "serena", "sohee", "uncle_fu", "vivian"]
 
 # Instruccion optimizada para narracion continua sin caidas de tono
 NARRATION_INSTRUCT = "narrando de forma continua y fluida, manteniendo entonacion estable sin caidas abruptas al final de las frases, como un audiolibro profesional"
 
+# Frase corta para el calentamiento tras cargar un modelo
+WARMUP_TEXT = "Hello."
+
+# Prompts de clonacion en memoria: uno por voz de referencia activa
+VOICE_CLONE_CACHE_SIZE = 32
+
+# Precision de trabajo del audio: de sobra para la salida PCM 16-bit
+AUDIO_DTYPE = np.float32
+
+# Media movil de 5 frames para suavizar la ganancia de dynamic_normalize
+GAIN_SMOOTH_KERNEL = np.full(5, 1 / 5)
+GAIN_SMOOTH_KERNEL.flags.writeable = False
+
+# Lecturas concurrentes de perfiles al abrir la libreria de voces
+VOICE_LOAD_WORKERS = 8
+
+# Chunks de un texto largo generados por llamada al modelo (memoria GPU acotada)
+CHUNK_BATCH_SIZE = 4
+
+# Textos largos ya divididos en chunks (reintentos con otra voz/estilo)
+TEXT_SPLIT_CACHE_SIZE = 32
+
+# Muestras por bloque al escribir audio largo de forma incremental
+STREAM_BLOCK_SAMPLES = 1 << 18
+
+# Ventanas de 10ms revisadas por bloque al recortar el silencio final
+TRIM_SCAN_WINDOWS = 64
+
+# Audios sintetizados reutilizables (frases repetidas en scripts/audiolibros)
+SYNTHESIS_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=16)
+def equal_power_fades(fade_samples: int, dtype=AUDIO_DTYPE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Curvas (fade_out, fade_in) de potencia constante; compartidas, solo lectura
+
+    Con dtype igual al del audio (float32) el crossfade no promueve a float64.
+    """
+    t = np.linspace(0, np.pi / 2, fade_samples)
+    fade_out = np.cos(t).astype(dtype, copy=False)  # De 1 a 0
+    fade_in = np.sin(t).astype(dtype, copy=False)   # De 0 a 1
+    fade_out.flags.writeable = False
+    fade_in.flags.writeable = False
+    return fade_out, fade_in
+
 
 class AudioProcessor:
     """Utilidades para procesamiento de audio de alta calidad"""
@@ -71,25 +94,76 @@ class AudioProcessor:
 
         # Curvas de potencia constante (equal power crossfade)
         # Esto evita el "dip" de volumen en el centro del fade
-        t = np.linspace(0, np.pi / 2, fade_samples)
-        fade_out = np.cos(t)  # De 1 a 0
-        fade_in = np.sin(t)   # De 0 a 1
+        dtype = np.result_type(audio1, audio2)
+        fade_out, fade_in = equal_power_fades(fade_samples, dtype)
+
+        # Salida reservada una vez: parte sin fade de audio1 + zona de
+        # crossfade + parte sin fade de audio2, sin copiar los audios enteros
+        result = np.empty(len(audio1) + len(audio2) - fade_samples, dtype=dtype)
+        head = len(audio1) - fade_samples
+        result[:head] = audio1[:head]
+        zone = result[head:head + fade_samples]
+        np.multiply(audio1[head:], fade_out, out=zone)
+        # Unico temporal: el tramo de fade-in (fade_samples muestras)
+        zone += np.multiply(audio2[:fade_samples], fade_in)
+        result[head + fade_samples:] = audio2[fade_samples:]
 
-        # Aplicar fades con atenuacion correcta
-        audio1_faded = audio1.copy()
-        audio2_faded = audio2.copy()
+        return result
 
-        audio1_faded[-fade_samples:] = audio1[-fade_samples:] * fade_out
-        audio2_faded[:fade_samples] = audio2[:fade_samples] * fade_in
+    @staticmethod
+    def crossfade_chain(audios: List[np.ndarray], pause_before: List[bool],
+                        fade_ms: int = 300, pause_s: float = 0.0,
+                        sample_rate: int = 24000) -> np.ndarray:
+        """
+        Une una secuencia de audios con crossfade_smooth en un solo buffer
 
-        # Combinar: parte sin fade de audio1 + zona de crossfade + parte sin fade de audio2
-        crossfade_zone = audio1_faded[-fade_samples:] + audio2_faded[:fade_samples]
+        Equivale a aplicar crossfade_smooth en cadena (con silencio previo
+        donde pause_before es True), pero calcula primero los offsets y
+        reserva la salida una sola vez en lugar de re-concatenar por segmento.
 
-        result = np.concatenate([
-            audio1[:-fade_samples],
-            crossfade_zone,
-            audio2[fade_samples:]
-        ])
+        Args:
+            audios: Audios en orden
+            pause_before: Si se inserta silencio antes de cada audio
+            fade_ms: Duracion del fade en ms
+            pause_s: Duracion del silencio en segundos
+            sample_rate: Tasa de muestreo
+
+        Returns:
+            Audio combinado
+        """
+        # Un solo audio: nada que mezclar, sin copiarlo a otro buffer
+        if len(audios) == 1:
+            return audios[0]
+
+        fade_samples = int(fade_ms * sample_rate / 1000)
+        pause_samples = int(pause_s * sample_rate)
+
+        # Primera pasada: offset de cada audio y si solapa con el anterior
+        offsets = []
+        overlaps = []
+        length = 0
+        for i, audio in enumerate(audios):
+            if i > 0 and pause_before[i]:
+                length += pause_samples
+            overlap = i > 0 and length >= fade_samples and len(audio) >= fade_samples
+            offset = length - fade_samples if overlap else length
+            offsets.append(offset)
+            overlaps.append(overlap)
+            length = offset + len(audio)
+
+        # Segunda pasada: copiar y sumar las zonas de crossfade en sitio
+        result = np.zeros(length, dtype=np.result_type(*audios, np.float32))
+        if any(overlaps):
+            fade_out, fade_in = equal_power_fades(fade_samples, result.dtype)
+
+        for audio, offset, overlap in zip(audios, offsets, overlaps):
+            if overlap:
+                zone = result[offset:offset + fade_samples]
+                zone *= fade_out
+                zone += audio[:fade_samples] * fade_in
+                result[offset + fade_samples:offset + len(audio)] = audio[fade_samples:]
+            else:
+                result[offset:offset + len(audio)] = audio
 
         return result
 
@@ -119,47 +193,144 @@ class AudioProcessor:
         Returns:
             Audio normalizado dinamicamente
         """
+        gains = AudioProcessor.dynamic_gain_curve(
+            audio, sample_rate, window_ms, target_db, max_gain, min_gain
+        )
+
+        # Interpolar la ganancia y aplicarla por bloques, en el dtype del audio
+        # (float32 del modelo): la curva interpolada nunca ocupa el largo completo
+        result = np.empty(len(audio), dtype=np.result_type(audio, AUDIO_DTYPE))
+        for start, block in AudioProcessor._gain_blocks(audio, gains, result.dtype):
+            result[start:start + len(block)] = block
+
+        # Limitar a rango valido (in-place: sin otra copia del buffer completo)
+        return np.clip(result, -1.0, 1.0, out=result)
+
+    @staticmethod
+    def _gain_blocks(audio: np.ndarray, gains: np.ndarray, dtype,
+                     block_samples: int = STREAM_BLOCK_SAMPLES):
+        """Genera (inicio, bloque con ganancia aplicada) recorriendo el audio"""
+        for start in range(0, len(audio), block_samples):
+            block = audio[start:start + block_samples]
+            gain = AudioProcessor._interp_gain(gains, len(audio), start, len(block), dtype)
+            gain *= block
+            yield start, gain
+
+    @staticmethod
+    def _interp_gain(gains: np.ndarray, length: int, start: int, n: int, dtype) -> np.ndarray:
+        """
+        Ganancia interpolada para las muestras [start, start + n)
+
+        Igual que np.interp sobre frames en np.linspace(0, length, len(gains)),
+        pero aprovechando el paso constante: cada tramo entre frames es una
+        recta, asi que basta repetir pendiente y ordenada por tramo (sin
+        busqueda por muestra). Las rectas van relativas a start para que el
+        calculo en float32 no pierda precision en audios largos.
+        """
+        if len(gains) == 1:
+            return np.full(n, gains[0], dtype=dtype)
+
+        step = length / (len(gains) - 1)
+        first = int(start // step)
+        last = min(int((start + n - 1) // step), len(gains) - 2)
+
+        # Muestras de cada tramo dentro del bloque
+        bounds = np.ceil(np.arange(first + 1, last + 1) * step).astype(np.intp) - start
+        counts = np.diff(np.clip(bounds, 0, n), prepend=0, append=n)
+
+        slopes = np.diff(gains[first:last + 2]) / step
+        offsets = gains[first:last + 1] - slopes * (np.arange(first, last + 1) * step - start)
+
+        gain = np.arange(n, dtype=dtype)
+        gain *= np.repeat(slopes.astype(dtype, copy=False), counts)
+        gain += np.repeat(offsets.astype(dtype, copy=False), counts)
+        return gain
+
+    @staticmethod
+    def dynamic_gain_curve(audio: np.ndarray, sample_rate: int = 24000,
+                           window_ms: int = 400, target_db: float = -6.0,
+                           max_gain: float = 2.5, min_gain: float = 0.6) -> np.ndarray:
+        """Envolvente de ganancia suavizada de dynamic_normalize (un valor por frame)"""
         window_samples = int(window_ms * sample_rate / 1000)
         hop_samples = window_samples // 2  # 50% overlap para suavidad
         target_rms = 10 ** (target_db / 20)
 
-        # Calcular envolvente de ganancia
+        # Audio mas corto que una ventana (p. ej. un titulo de una palabra):
+        # sin frames que medir, ganancia unitaria
+        if len(audio) < window_samples:
+            return np.ones(1)
+
+        # Calcular envolvente de ganancia: RMS de todas las ventanas de una vez
+        # sobre una vista solapada del audio (sin copiar las ventanas)
         num_frames = (len(audio) - window_samples) // hop_samples + 1
+        frames = np.lib.stride_tricks.sliding_window_view(audio, window_samples)[::hop_samples]
+        rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / window_samples)
+
+        # Solo ajustar donde hay señal
         gains = np.ones(num_frames)
+        voiced = rms > 0.001
+        gains[voiced] = np.clip(target_rms / rms[voiced], min_gain, max_gain)
 
-        for i in range(num_frames):
-            start = i * hop_samples
-            end = start + window_samples
-            window = audio[start:end]
-            rms = np.sqrt(np.mean(window ** 2))
+        # Suavizar curva de ganancia con filtro de media movil
+        if len(gains) > len(GAIN_SMOOTH_KERNEL):
+            gains = np.convolve(gains, GAIN_SMOOTH_KERNEL, mode='same')
 
-            if rms > 0.001:  # Solo ajustar si hay señal
-                gain = target_rms / rms
-                gains[i] = np.clip(gain, min_gain, max_gain)
+        return gains
 
-        # Suavizar curva de ganancia con filtro de media movil
-        kernel_size = 5
-        if len(gains) > kernel_size:
-            kernel = np.ones(kernel_size) / kernel_size
-            gains = np.convolve(gains, kernel, mode='same')
-
-        # Interpolar ganancia a longitud del audio
-        gain_interp = np.interp(
-            np.arange(len(audio)),
-            np.linspace(0, len(audio), len(gains)),
-            gains
-        )
+    @staticmethod
+    def write_dynamic_normalized(writer: "WavAppender", audio: np.ndarray,
+                                 block_samples: int = STREAM_BLOCK_SAMPLES, **kwargs):
+        """
+        Aplica dynamic_normalize y vuelca el resultado al WAV por bloques
 
-        # Aplicar ganancia
-        result = audio * gain_interp
+        Mismo resultado que escribir dynamic_normalize(audio), pero la ganancia
+        interpolada y el audio normalizado existen solo bloque a bloque, no
+        como dos copias float64 del audio completo.
+        """
+        gains = AudioProcessor.dynamic_gain_curve(audio, writer.sample_rate, **kwargs)
+        dtype = np.result_type(audio, AUDIO_DTYPE)
 
-        # Limitar a rango valido
-        return np.clip(result, -1.0, 1.0)
+        for _, block in AudioProcessor._gain_blocks(audio, gains, dtype, block_samples):
+            # to_pcm16 recorta a [-1, 1]
+            writer.append(block)
 
     @staticmethod
+    def write_wav_pcm16(path: str, audio: np.ndarray, sample_rate: int = 24000):
+        """
+        Escribe audio mono float [-1, 1] como WAV PCM 16-bit sin pasar por libsndfile
+
+        Cabecera RIFF de 44 bytes + volcado directo del buffer int16: una sola
+        conversion float->int16 y ninguna copia intermedia de libsndfile.
+        """
+        pcm = AudioProcessor.to_pcm16(audio)
+        with open(path, 'wb') as f:
+            f.write(AudioProcessor.wav_header_pcm16(pcm.nbytes, sample_rate))
+            pcm.tofile(f)
+
+    @staticmethod
+    def to_pcm16(audio: np.ndarray) -> np.ndarray:
+        """Convierte audio float [-1, 1] a int16 little-endian"""
+        pcm = np.clip(audio, -1.0, 1.0)
+        pcm *= 32767.0
+        return np.rint(pcm, out=pcm).astype('<i2')
+
+    @staticmethod
+    def wav_header_pcm16(data_size: int, sample_rate: int) -> bytes:
+        """Cabecera RIFF/WAVE de 44 bytes para PCM 16-bit mono"""
+        return struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+            b'data', data_size,
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=8)
     def add_silence(duration_s: float, sample_rate: int = 24000) -> np.ndarray:
-        """Genera silencio de duracion especificada"""
-        return np.zeros(int(duration_s * sample_rate))
+        """Silencio de duracion especificada; compartido entre llamadas, solo lectura"""
+        silence = np.zeros(int(duration_s * sample_rate), dtype=AUDIO_DTYPE)
+        silence.flags.writeable = False
+        return silence
 
     @staticmethod
     def trim_silence_end(audio: np.ndarray, threshold_db: float = -40,
@@ -167,18 +338,130 @@ class AudioProcessor:
         """Recorta silencio al final del audio"""
         threshold = 10 ** (threshold_db / 20)
 
-        # Buscar desde el final donde hay señal
+        # Buscar desde el final donde hay señal, por bloques de ventanas:
+        # cada bloque es una sola reduccion (filas = ventanas de 10ms)
         end_idx = len(audio)
         window = int(0.01 * sample_rate)  # Ventana de 10ms
-
-        for i in range(len(audio) - window, 0, -window):
-            if np.max(np.abs(audio[i:i+window])) > threshold:
+        num_windows = len(range(len(audio) - window, 0, -window))
+
+        for k0 in range(0, num_windows, TRIM_SCAN_WINDOWS):
+            k1 = min(num_windows, k0 + TRIM_SCAN_WINDOWS)
+            start = len(audio) - window * k1
+            block = audio[start:len(audio) - window * k0].reshape(k1 - k0, window)
+            voiced = np.flatnonzero(np.abs(block).max(axis=1) > threshold)
+            if voiced.size:
+                i = start + voiced[-1] * window
                 end_idx = min(i + window * 2, len(audio))  # Dejar un poco de cola
                 break
 
         return audio[:end_idx]
 
 
+class WavAppender:
+    """
+    Escritor WAV PCM 16-bit incremental
+
+    Cada append() vuelca el bloque directamente al archivo, asi la memoria
+    queda acotada al bloque mas grande; close() corrige los tamaños RIFF/data
+    de la cabecera.
+    """
+
+    def __init__(self, path: str, sample_rate: int = 24000):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.data_size = 0
+        self._file = open(path, 'wb')
+        self._file.write(AudioProcessor.wav_header_pcm16(0, sample_rate))
+
+    def append(self, audio: np.ndarray):
+        """Agrega un bloque de audio float [-1, 1]"""
+        if len(audio) == 0:
+            return
+        self.append_pcm16(AudioProcessor.to_pcm16(audio))
+
+    def append_pcm16(self, pcm: np.ndarray):
+        """Agrega muestras int16 tal cual (sin reconvertir desde float)"""
+        pcm = pcm.astype('<i2', copy=False)
+        pcm.tofile(self._file)
+        self.data_size += pcm.nbytes
+
+    def close(self):
+        """Escribe los tamaños finales en la cabecera y cierra el archivo"""
+        if self._file.closed:
+            return
+        self._file.seek(4)
+        self._file.write(struct.pack('<I', 36 + self.data_size))
+        self._file.seek(40)
+        self._file.write(struct.pack('<I', self.data_size))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SynthesisCache:
+    """
+    Cache LRU de audios ya sintetizados, en memoria y en disco (.npy)
+
+    La clave resume todo lo que determina la generacion (texto, voz, estilo,
+    idioma, modelo). Los archivos de sesiones anteriores se registran al
+    iniciar y se cargan bajo demanda; al desalojar una entrada se borra
+    tambien su archivo, asi el disco queda acotado igual que la memoria.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = SYNTHESIS_CACHE_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        # clave -> audio (None = solo en disco, aun sin cargar)
+        self._entries: "OrderedDict[str, Optional[np.ndarray]]" = OrderedDict()
+
+        files = sorted(self.cache_dir.glob("*.npy"), key=lambda f: f.stat().st_mtime)
+        for f in files:
+            self._entries[f.stem] = None
+        self._evict()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Firma de los parametros de generacion"""
+        key = "|".join("" if part is None else str(part) for part in parts)
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Audio cacheado o None"""
+        if key not in self._entries:
+            return None
+        audio = self._entries[key]
+        if audio is None:
+            try:
+                audio = np.load(self._path(key))
+            except (OSError, ValueError):
+                del self._entries[key]
+                return None
+            self._entries[key] = audio
+        self._entries.move_to_end(key)
+        return audio
+
+    def put(self, key: str, audio: np.ndarray):
+        """Guarda un audio (float32) en memoria y en disco"""
+        audio = np.asarray(audio, dtype=np.float32)
+        np.save(self._path(key), audio)
+        self._entries[key] = audio
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            self._path(key).unlink(missing_ok=True)
+
+
 class TextSplitter:
     """
     Divide texto para TTS respetando estructura linguistica
@@ -189,40 +472,43 @@ class TextSplitter:
     PARAGRAPH_SEP = re.compile(r'\n\s*\n')
 
     # Abreviaciones comunes que no terminan oracion
-    ABBREVIATIONS = {'Dr', 'Sr', 'Sra', 'Srta', 'Prof', 'Ing', 'Lic', 'Jr', 'St',
-                     'Mr', 'Mrs', 'Ms', 'vs', 'etc', 'Inc', 'Ltd', 'Corp', 'Ave'}
+    ABBREVIATIONS = frozenset({'Dr', 'Sr', 'Sra', 'Srta', 'Prof', 'Ing', 'Lic', 'Jr', 'St',
+                               'Mr', 'Mrs', 'Ms', 'vs', 'etc', 'Inc', 'Ltd', 'Corp', 'Ave'})
+    # Puntuacion final que se ignora al comparar con ABBREVIATIONS
+    ABBREVIATION_TRAILING = '.,!?;:'
 
     @classmethod
     def split_sentences(cls, text: str) -> List[str]:
         """
         Divide texto en oraciones respetando abreviaciones
+
+        Solo las palabras terminadas en . ! ? se revisan una a una; cada
+        oracion se arma con un unico join de su tramo de palabras.
         """
         sentences = []
-        current = ""
+        start = 0
 
         # Tokenizar por espacios y puntuacion
         words = text.split()
+        num_words = len(words)
+        candidates = [i for i, word in enumerate(words) if word.endswith(('.', '!', '?'))]
 
-        for i, word in enumerate(words):
-            current += word + " "
+        for i in candidates:
+            word = words[i]
 
             # Verificar si termina oracion
-            if word.rstrip('.,!?;:') in cls.ABBREVIATIONS:
+            if word.rstrip(cls.ABBREVIATION_TRAILING) in cls.ABBREVIATIONS:
                 continue  # No es fin de oracion
 
-            if word.endswith(('.', '!', '?')):
-                # Verificar que no sea abreviacion seguida de minuscula
-                if i + 1 < len(words):
-                    next_word = words[i + 1]
-                    if next_word[0].isupper() or word.endswith(('!', '?')):
-                        sentences.append(current.strip())
-                        current = ""
-                else:
-                    sentences.append(current.strip())
-                    current = ""
+            # Tras un punto, solo corta si sigue mayuscula (o es el final)
+            if i + 1 < num_words and not (words[i + 1][0].isupper() or word.endswith(('!', '?'))):
+                continue
+
+            sentences.append(" ".join(words[start:i + 1]))
+            start = i + 1
 
-        if current.strip():
-            sentences.append(current.strip())
+        if start < num_words:
+            sentences.append(" ".join(words[start:]))
 
         return sentences
 
@@ -240,6 +526,14 @@ class TextSplitter:
         Returns:
             Lista de dicts con 'text', 'is_paragraph_end', 'context_prefix'
         """
+        # Copias: los dicts cacheados nunca salen hacia el llamador
+        return [dict(chunk) for chunk in cls._split_for_tts_cached(text, max_chars, overlap_words)]
+
+    @classmethod
+    @lru_cache(maxsize=TEXT_SPLIT_CACHE_SIZE)
+    def _split_for_tts_cached(cls, text: str, max_chars: int,
+                              overlap_words: int) -> Tuple[Dict[str, Any], ...]:
+        """split_for_tts memoizado: reintentos con otra voz/estilo no re-tokenizan"""
         # Para textos muy largos, usar chunks mas grandes para reducir uniones
         if len(text) > 50000:
             max_chars = max(max_chars, 2000)
@@ -253,7 +547,7 @@ class TextSplitter:
 
         previous_context = ""
 
-        for para_idx, paragraph in enumerate(paragraphs):
+        for paragraph in paragraphs:
             # Si el parrafo es corto, mantenerlo completo
             if len(paragraph) <= max_chars:
                 chunks.append({
@@ -262,44 +556,52 @@ class TextSplitter:
                     'is_paragraph_end': True
                 })
                 # Actualizar contexto: ultimas N palabras
-                words = paragraph.split()
-                previous_context = " ".join(words[-overlap_words:]) if len(words) > overlap_words else paragraph
+                previous_context = cls._context_tail(paragraph, overlap_words)
                 continue
 
             # Dividir parrafo largo en oraciones
             sentences = cls.split_sentences(paragraph)
 
-            current_chunk = ""
-            for sent_idx, sentence in enumerate(sentences):
-                is_last = sent_idx == len(sentences) - 1
-
-                if len(current_chunk) + len(sentence) + 1 <= max_chars:
-                    current_chunk = (current_chunk + " " + sentence).strip()
+            # Oraciones del chunk en curso; se unen solo al cerrarlo
+            current = []
+            current_len = 0
+            for sentence in sentences:
+                if current_len + len(sentence) + 1 <= max_chars:
+                    current_len += len(sentence) + (1 if current else 0)
+                    current.append(sentence)
                 else:
                     # Guardar chunk actual
-                    if current_chunk:
+                    if current:
+                        current_chunk = " ".join(current)
                         chunks.append({
                             'text': current_chunk,
                             'context_prefix': previous_context,
                             'is_paragraph_end': False
                         })
                         # Actualizar contexto
-                        words = current_chunk.split()
-                        previous_context = " ".join(words[-overlap_words:]) if len(words) > overlap_words else current_chunk
+                        previous_context = cls._context_tail(current_chunk, overlap_words)
 
-                    current_chunk = sentence
+                    current = [sentence]
+                    current_len = len(sentence)
 
             # Ultimo chunk del parrafo
-            if current_chunk:
+            if current:
+                current_chunk = " ".join(current)
                 chunks.append({
                     'text': current_chunk,
                     'context_prefix': previous_context,
                     'is_paragraph_end': True
                 })
-                words = current_chunk.split()
-                previous_context = " ".join(words[-overlap_words:]) if len(words) > overlap_words else current_chunk
+                previous_context = cls._context_tail(current_chunk, overlap_words)
 
-        return chunks
+        return tuple(chunks)
+
+    @staticmethod
+    def _context_tail(text: str, overlap_words: int) -> str:
+        """Ultimas overlap_words palabras de text (text completo si no tiene mas)"""
+        # rsplit acotado: solo separa las palabras finales, no todo el chunk
+        words = text.rsplit(None, overlap_words) if overlap_words > 0 else text.split()
+        return " ".join(words[-overlap_words:]) if len(words) > overlap_words else text
 
     @classmethod
     def estimate_audio_duration(cls, text: str, chars_per_second: float = 14) -> float:
@@ -308,19 +610,19 @@ class TextSplitter:
 
 
 class LRUCache:
-    """Cache LRU simple para voice clone prompts"""
+    """Cache LRU simple para voice clone prompts (claves: cualquier hashable)"""
 
     def __init__(self, max_size: int = 5):
         self.cache = OrderedDict()
         self.max_size = max_size
 
-    def get(self, key: str):
+    def get(self, key: Hashable):
         if key in self.cache:
             self.cache.move_to_end(key)
             return self.cache[key]
         return None
 
-    def put(self, key: str, value):
+    def put(self, key: Hashable, value):
         if key in self.cache:
             self.cache.move_to_end(key)
         else:
@@ -339,13 +641,18 @@ class TTSEngine:
     # ~14 caracteres/segundo = ~8400 caracteres para 10 min
     MAX_CHARS_NO_CHUNK = 6000  # Margen de seguridad
 
-    def __init__(self, device: str = "cuda", dtype: torch.dtype = torch.bfloat16):
+    def __init__(self, device: str = "cuda", dtype: torch.dtype = torch.bfloat16,
+                 quantization: Optional[str] = None):
         self.device = device
         self.dtype = dtype
+        # "int8": pesos cuantizados con torchao (opcional, solo en CUDA)
+        self.quantization = quantization
         self.current_model_name = None
         self.model = None
         self.sample_rate = 24000
-        self._voice_clone_cache = LRUCache(max_size=5)
+        self._voice_clone_cache = LRUCache(max_size=VOICE_CLONE_CACHE_SIZE)
+        # Carpeta donde persistir los prompts de clonacion entre sesiones (opcional)
+        self.prompt_cache_dir: Optional[Path] = None
         self.audio_processor = AudioProcessor()
         self.text_splitter = TextSplitter()
 
@@ -373,6 +680,62 @@ class TTSEngine:
         self.current_model_name = model_version
         print(f"TTS {model_version} cargado")
 
+        if self.quantization and self.device == "cuda":
+            self._quantize()
+
+        if self.device == "cuda":
+            self._warmup()
+
+    def _quantize(self):
+        """
+        Cuantiza los pesos de las capas lineales a int8 (weight-only)
+
+        La decodificacion autoregresiva esta limitada por ancho de banda de
+        memoria: leer pesos int8 en vez de bf16 mueve la mitad de bytes por
+        paso. Si torchao no esta instalado se sigue en bf16.
+        """
+        if self.quantization != "int8":
+            print(f"Cuantizacion no soportada: {self.quantization}")
+            return
+
+        try:
+            from torchao.quantization import quantize_, int8_weight_only
+        except ImportError:
+            print("torchao no disponible, modelo en bf16 sin cuantizar")
+            return
+
+        # Qwen3TTSModel envuelve el nn.Module en .model
+        module = getattr(self.model, "model", self.model)
+        try:
+            quantize_(module, int8_weight_only())
+            print("Pesos TTS cuantizados a int8")
+        except Exception as e:
+            print(f"Cuantizacion int8 omitida: {e}")
+
+    @torch.inference_mode()
+    def _warmup(self):
+        """
+        Pasada corta de calentamiento tras cargar el modelo
+
+        Paga en la carga los costos unicos de CUDA (handles de cuBLAS, carga
+        perezosa de kernels, crecimiento del allocator) en vez de en la primera
+        generacion del usuario. El modelo Base necesita audio de referencia,
+        asi que no se calienta.
+        """
+        if "voice_clone" in MODEL_CAPABILITIES.get(self.current_model_name, []):
+            return
+
+        try:
+            self.model.generate_custom_voice(
+                text=WARMUP_TEXT,
+                language="English",
+                speaker="Ryan",
+                instruct=NARRATION_INSTRUCT,
+            )
+            torch.cuda.synchronize()
+        except Exception as e:
+            print(f"Calentamiento de TTS omitido: {e}")
+
     def unload_model(self):
         """Libera memoria del modelo TTS"""
         if self.model is not None:
@@ -441,17 +804,59 @@ class TTSEngine:
                 crossfade_ms, paragraph_pause_s
             )
 
-        # Post-procesamiento
+        # Post-procesamiento (en float32 desde la salida del modelo)
+        audio = np.asarray(audio, dtype=AUDIO_DTYPE)
         audio = self.audio_processor.trim_silence_end(audio, sample_rate=self.sample_rate)
 
         if normalize_audio:
             audio = self.audio_processor.dynamic_normalize(audio, self.sample_rate)
 
         if output_path:
-            sf.write(output_path, audio, self.sample_rate, format='WAV', subtype='PCM_16')
+            # Cuantizado una sola vez aqui (con recorte); libsndfile escribe el int16 tal cual
+            pcm = self.audio_processor.to_pcm16(audio)
+            sf.write(output_path, pcm, self.sample_rate, format='WAV', subtype='PCM_16')
 
         return audio, self.sample_rate
 
+    def generate_batch(
+        self,
+        texts: List[str],
+        ref_audio_path: Optional[str] = None,
+        ref_text: Optional[str] = None,
+        instruct: Optional[str] = None,
+        language: str = "Spanish",
+        speaker: Optional[str] = None,
+        normalize_audio: bool = True,
+        add_narration_style: bool = True
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Genera varios textos cortos con la misma voz en una sola llamada al modelo
+
+        Los textos deben caber sin chunking (<= MAX_CHARS_NO_CHUNK); el resto
+        del post-procesamiento es el mismo que en generate().
+
+        Returns:
+            Tuple (lista de audios en el orden de texts, sample_rate)
+        """
+        if self.model is None:
+            self.load_model()
+
+        final_instruct = self._prepare_instruct(instruct, add_narration_style)
+
+        wavs = self._generate_chunk_batch(
+            texts, ref_audio_path, ref_text, final_instruct, language, speaker
+        )
+
+        results = []
+        for audio in wavs:
+            audio = np.asarray(audio, dtype=AUDIO_DTYPE)
+            audio = self.audio_processor.trim_silence_end(audio, sample_rate=self.sample_rate)
+            if normalize_audio:
+                audio = self.audio_processor.dynamic_normalize(audio, self.sample_rate)
+            results.append(audio)
+
+        return results, self.sample_rate
+
     def _prepare_instruct(self, custom_instruct: Optional[str], add_narration: bool) -> str:
         """Prepara instruccion final consistente"""
         if custom_instruct:
@@ -484,40 +889,45 @@ class TTSEngine:
                 instruct, language, speaker
             )
 
+        # Texto a generar por chunk: despues del primero se antepone el
+        # contexto (ayuda al modelo a mantener la prosodia) y luego se recorta
+        texts = []
+        for i, chunk_info in enumerate(chunks):
+            context_prefix = chunk_info['context_prefix']
+            if i > 0 and context_prefix:
+                texts.append(f"{context_prefix} {chunk_info['text']}")
+            else:
+                texts.append(chunk_info['text'])
+
+        # Chunks consecutivos en lotes: una llamada al modelo por lote en vez
+        # de una por chunk (misma voz e instruccion para todos)
+        audios = []
+        for start in range(0, len(texts), CHUNK_BATCH_SIZE):
+            audios.extend(self._generate_chunk_batch(
+                texts[start:start + CHUNK_BATCH_SIZE], ref_audio_path, ref_text,
+                instruct, language, speaker
+            ))
+
         all_segments = []
 
-        for i, chunk_info in enumerate(chunks):
-            chunk_text = chunk_info['text']
+        for i, (chunk_info, audio) in enumerate(zip(chunks, audios)):
+            audio = np.asarray(audio, dtype=AUDIO_DTYPE)
             context_prefix = chunk_info['context_prefix']
-            is_para_end = chunk_info['is_paragraph_end']
 
-            # Para chunks despues del primero, incluir contexto
-            # Esto ayuda al modelo a mantener la prosodia
             if i > 0 and context_prefix:
-                # Generamos con contexto pero luego recortamos
-                full_text = f"{context_prefix} {chunk_text}"
-                audio = self._generate_chunk(
-                    full_text, ref_audio_path, ref_text,
-                    instruct, language, speaker
-                )
                 # Estimar donde empieza el texto nuevo
                 context_duration = self.text_splitter.estimate_audio_duration(context_prefix)
                 context_samples = int(context_duration * self.sample_rate)
                 # Recortar contexto (con pequeño margen para transicion)
                 trim_start = max(0, context_samples - int(0.1 * self.sample_rate))
                 audio = audio[trim_start:]
-            else:
-                audio = self._generate_chunk(
-                    chunk_text, ref_audio_path, ref_text,
-                    instruct, language, speaker
-                )
 
             # Recortar silencios al final de cada chunk
             audio = self.audio_processor.trim_silence_end(audio, sample_rate=self.sample_rate)
 
             all_segments.append({
                 'audio': audio,
-                'is_paragraph_end': is_para_end
+                'is_paragraph_end': chunk_info['is_paragraph_end']
             })
 
         # Combinar segmentos
@@ -528,36 +938,66 @@ class TTSEngine:
         crossfade_ms: int,
         paragraph_pause_s: float
     ) -> np.ndarray:
-        """Combina segmentos con crossfade y pausas naturales"""
+        """
+        Combina segmentos con crossfade y pausas naturales
+
+        Mismo resultado que encadenar crossfade_smooth sobre el audio
+        acumulado, pero sin re-copiarlo en cada paso: se guardan las piezas
+        (solo el tramo de crossfade es nuevo) y se concatenan una vez al final.
+        """
         if not segments:
             return np.array([])
 
         if len(segments) == 1:
             return segments[0]['audio']
 
-        result = segments[0]['audio']
+        fade_samples = int(crossfade_ms * self.sample_rate / 1000)
+        # Curvas cacheadas en el dtype de los segmentos (float32 del modelo)
+        dtype = np.result_type(*(segment['audio'] for segment in segments))
+        fade_out, fade_in = equal_power_fades(fade_samples, dtype)
+
+        # Un solo silencio compartido por todos los fines de parrafo
+        pause = self.audio_processor.add_silence(paragraph_pause_s, self.sample_rate).astype(dtype, copy=False)
+
+        parts = [segments[0]['audio']]
+        total = len(parts[0])
 
         for i in range(1, len(segments)):
             prev_is_para_end = segments[i - 1]['is_paragraph_end']
             curr_audio = segments[i]['audio']
 
-            # Aplicar crossfade suave
-            result = self.audio_processor.crossfade_smooth(
-                result, curr_audio, crossfade_ms, self.sample_rate
-            )
+            # Aplicar crossfade suave (o concatenar si alguno es muy corto)
+            if not fade_samples or total < fade_samples or len(curr_audio) < fade_samples:
+                head = curr_audio[:fade_samples]
+            else:
+                tail = self._pop_tail(parts, fade_samples)
+                head = tail * fade_out + curr_audio[:fade_samples] * fade_in
+                head = head.astype(np.result_type(tail, curr_audio), copy=False)
+                total -= fade_samples
+            parts.append(head)
 
-            # Agregar pausa SOLO si es fin de parrafo
+            # Agregar pausa SOLO si es fin de parrafo, justo tras la zona de crossfade
             if prev_is_para_end and paragraph_pause_s > 0:
-                pause = self.audio_processor.add_silence(paragraph_pause_s, self.sample_rate)
-                # Insertar pausa en el punto del crossfade
-                insert_point = len(result) - len(curr_audio) + int(crossfade_ms * self.sample_rate / 1000)
-                result = np.concatenate([
-                    result[:insert_point],
-                    pause,
-                    result[insert_point:]
-                ])
+                parts.append(pause)
+                total += len(pause)
 
-        return result
+            parts.append(curr_audio[fade_samples:])
+            total += len(curr_audio)
+
+        return np.concatenate(parts)
+
+    @staticmethod
+    def _pop_tail(parts: List[np.ndarray], n: int) -> np.ndarray:
+        """Quita y devuelve las ultimas n muestras de la lista de piezas"""
+        tail = []
+        while n > 0:
+            part = parts.pop()
+            if len(part) > n:
+                parts.append(part[:-n])
+                part = part[-n:]
+            tail.append(part)
+            n -= len(part)
+        return tail[0] if len(tail) == 1 else np.concatenate(tail[::-1])
 
     def _generate_chunk(
         self, text: str, ref_audio_path: Optional[str], ref_text: Optional[str],
@@ -581,11 +1021,56 @@ class TTSEngine:
                 self.load_model("1.7B")
             return self._generate_custom_voice(text, speaker, instruct, language)
 
-    def _generate_custom_voice(
-        self, text: str, speaker: Optional[str],
-        instruct: str, language: str
-    ) -> np.ndarray:
-        """Genera audio con speaker predefinido"""
+    def _generate_chunk_batch(
+        self, texts: List[str], ref_audio_path: Optional[str], ref_text: Optional[str],
+        instruct: str, language: str, speaker: Optional[str]
+    ) -> List[np.ndarray]:
+        """Version por lotes de _generate_chunk (misma voz e instruccion para todo el lote)"""
+        if len(texts) == 1:
+            return [self._generate_chunk(texts[0], ref_audio_path, ref_text, instruct, language, speaker)]
+
+        current_caps = MODEL_CAPABILITIES.get(self.current_model_name, [])
+        n = len(texts)
+
+        if ref_audio_path and ref_text:
+            if "voice_clone" not in current_caps:
+                print("Cambiando a modelo 1.7B-Base para clonacion...")
+                self.load_model("1.7B-Base")
+            prompt_items = self._get_voice_clone_prompt(ref_audio_path, ref_text)
+            with torch.inference_mode():
+                wavs, sr = self.model.generate_voice_clone(
+                    text=texts,
+                    language=[language] * n,
+                    voice_clone_prompt=prompt_items,
+                )
+
+        elif "voice_design" in current_caps:
+            with torch.inference_mode():
+                wavs, sr = self.model.generate_custom_voice(
+                    text=texts,
+                    language=[language] * n,
+                    speaker=["Ryan"] * n,
+                    instruct=[instruct or "natural and clear, maintaining steady intonation"] * n,
+                )
+
+        else:
+            if "custom_voice" not in current_caps:
+                print("Cambiando a modelo 1.7B para speakers predefinidos...")
+                self.load_model("1.7B")
+            speaker = self._resolve_speaker(speaker, language)
+            with torch.inference_mode():
+                wavs, sr = self.model.generate_custom_voice(
+                    text=texts,
+                    language=[language] * n,
+                    speaker=[speaker] * n,
+                    instruct=[instruct or NARRATION_INSTRUCT] * n,
+                )
+
+        self.sample_rate = sr
+        return list(wavs)
+
+    def _resolve_speaker(self, speaker: Optional[str], language: str) -> str:
+        """Normaliza el speaker predefinido (default por idioma, fallback a 'ryan')"""
         if not speaker:
             lang_speakers = SPEAKERS.get(language, SPEAKERS["English"])
             speaker = lang_speakers[0] if lang_speakers else "ryan"
@@ -594,6 +1079,15 @@ class TTSEngine:
         if speaker not in ALL_SPEAKERS:
             print(f"Speaker '{speaker}' no valido, usando 'ryan'")
             speaker = "ryan"
+        return speaker
+
+    @torch.inference_mode()
+    def _generate_custom_voice(
+        self, text: str, speaker: Optional[str],
+        instruct: str, language: str
+    ) -> np.ndarray:
+        """Genera audio con speaker predefinido"""
+        speaker = self._resolve_speaker(speaker, language)
 
         wavs, sr = self.model.generate_custom_voice(
             text=text,
@@ -605,6 +1099,7 @@ class TTSEngine:
         self.sample_rate = sr
         return wavs[0] if isinstance(wavs, list) else wavs
 
+    @torch.inference_mode()
     def _generate_voice_design(
         self, text: str, instruct: str, language: str
     ) -> np.ndarray:
@@ -619,21 +1114,13 @@ class TTSEngine:
         self.sample_rate = sr
         return wavs[0] if isinstance(wavs, list) else wavs
 
+    @torch.inference_mode()
     def _generate_clone(
         self, text: str, ref_audio_path: str,
         ref_text: str, language: str
     ) -> np.ndarray:
         """Genera audio clonando voz de referencia"""
-        cache_key = f"{ref_audio_path}:{ref_text[:50]}"
-
-        prompt_items = self._voice_clone_cache.get(cache_key)
-        if prompt_items is None:
-            print(f"Creando prompt de clonacion para: {Path(ref_audio_path).name}")
-            prompt_items = self.model.create_voice_clone_prompt(
-                ref_audio=ref_audio_path,
-                ref_text=ref_text,
-            )
-            self._voice_clone_cache.put(cache_key, prompt_items)
+        prompt_items = self._get_voice_clone_prompt(ref_audio_path, ref_text)
 
         wavs, sr = self.model.generate_voice_clone(
             text=text,
@@ -644,6 +1131,61 @@ class TTSEngine:
         self.sample_rate = sr
         return wavs[0] if isinstance(wavs, list) else wavs
 
+    def encode_reference(self, ref_audio_path: str, ref_text: str):
+        """
+        Precalcula el prompt de clonacion de una voz de referencia
+
+        Queda en cache hasta descargar el modelo, asi que las llamadas a
+        generate() con la misma referencia no vuelven a codificarla.
+        """
+        if self.model is None:
+            raise RuntimeError("Modelo no cargado")
+        return self._get_voice_clone_prompt(ref_audio_path, ref_text)
+
+    @torch.inference_mode()
+    def _get_voice_clone_prompt(self, ref_audio_path: str, ref_text: str):
+        """Prompt de clonacion cacheado por audio + transcripcion"""
+        # Transcripcion completa en la clave: dos referencias con el mismo
+        # inicio de texto no deben compartir prompt. La tupla no concatena
+        # strings y el hash de ref_text queda cacheado en el propio str
+        cache_key = (ref_audio_path, ref_text)
+
+        prompt_items = self._voice_clone_cache.get(cache_key)
+        if prompt_items is None:
+            prompt_path = self._prompt_cache_path(ref_audio_path, ref_text)
+            if prompt_path is not None and prompt_path.exists():
+                try:
+                    prompt_items = torch.load(
+                        prompt_path, map_location=self.device, mmap=True, weights_only=False
+                    )
+                except Exception as e:
+                    print(f"Prompt en disco invalido ({prompt_path.name}): {e}")
+
+            if prompt_items is None:
+                print(f"Creando prompt de clonacion para: {Path(ref_audio_path).name}")
+                prompt_items = self.model.create_voice_clone_prompt(
+                    ref_audio=ref_audio_path,
+                    ref_text=ref_text,
+                )
+                if prompt_path is not None:
+                    torch.save(prompt_items, prompt_path)
+            self._voice_clone_cache.put(cache_key, prompt_items)
+        return prompt_items
+
+    def _prompt_cache_path(self, ref_audio_path: str, ref_text: str) -> Optional[Path]:
+        """Archivo del prompt en disco: depende del modelo, del audio (y su mtime) y del texto"""
+        if self.prompt_cache_dir is None:
+            return None
+        try:
+            mtime = Path(ref_audio_path).stat().st_mtime_ns
+        except OSError:
+            return None
+        key = SynthesisCache.make_key(
+            self.current_model_name, Path(ref_audio_path).resolve(), mtime, ref_text
+        )
+        self.prompt_cache_dir.mkdir(parents=True, exist_ok=True)
+        return self.prompt_cache_dir / f"{key}.pt"
+
     def get_speakers(self, language: str = None) -> List[str]:
         """Retorna speakers disponibles"""
         if language:
@@ -661,23 +1203,39 @@ class VoiceLibrary:
         self._load_library()
 
     def _load_library(self):
-        """Carga perfiles de voz existentes"""
-        import json
+        """Carga perfiles de voz existentes (lecturas en paralelo, orden del glob)"""
+        from concurrent.futures import ThreadPoolExecutor
 
-        for json_file in self.library_path.glob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    profile = json.load(f)
-                    self.voices[profile["name"]] = profile
-            except Exception as e:
-                print(f"Error cargando {json_file}: {e}")
+        json_files = list(self.library_path.glob("*.json"))
+        if not json_files:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(VOICE_LOAD_WORKERS, len(json_files))) as pool:
+            profiles = list(pool.map(self._load_profile, json_files))
+
+        for entry in profiles:
+            if entry is not None:
+                name, profile = entry
+                self.voices[name] = profile
+
+    @staticmethod
+    def _load_profile(json_file: Path) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Lee y decodifica un perfil; None si el archivo es invalido"""
+        import orjson
+
+        try:
+            profile = orjson.loads(json_file.read_bytes())
+            return profile["name"], profile
+        except Exception as e:
+            print(f"Error cargando {json_file}: {e}")
+            return None
 
     def add_voice(
         self, name: str, audio_path: str, transcript: str,
         language: str = "Spanish", style_tags: List[str] = None
     ) -> Dict[str, Any]:
         """Agrega una nueva voz a la libreria"""
-        import json
+        import orjson
         import shutil
 
         audio_dest = self.library_path / f"{name}.wav"
@@ -692,8 +1250,8 @@ class VoiceLibrary:
         }
 
         json_path = self.library_path / f"{name}.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(profile, f, ensure_ascii=False, indent=2)
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(profile, option=orjson.OPT_INDENT_2))
 
         self.voices[name] = profile
         return profile
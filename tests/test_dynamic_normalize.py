@@ -0,0 +1,30 @@
+"""
+Normalizacion dinamica con audios mas cortos que la ventana de analisis
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("soundfile")
+
+from src.tts_engine import AudioProcessor, WavAppender
+
+
+def test_dynamic_normalize_clip_shorter_than_window():
+    # 200 ms a 24 kHz: menos que la ventana de 400 ms
+    audio = np.full(4800, 0.1, dtype=np.float32)
+
+    result = AudioProcessor.dynamic_normalize(audio, sample_rate=24000)
+
+    assert result.shape == audio.shape
+    np.testing.assert_array_equal(result, audio)
+
+
+def test_write_dynamic_normalized_clip_shorter_than_window(tmp_path):
+    audio = np.full(4800, 0.1, dtype=np.float32)
+    path = tmp_path / "corto.wav"
+
+    with WavAppender(str(path), 24000) as writer:
+        AudioProcessor.write_dynamic_normalized(writer, audio)
+
+    assert writer.data_size == audio.size * 2